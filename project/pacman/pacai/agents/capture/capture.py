@@ -13,7 +13,7 @@ class CaptureAgent(BaseAgent):
     and implement `CaptureAgent.chooseAction`.
     """
 
-    def __init__(self, index, timeForComputing = 0.1, **kwargs):
+    def __init__(self, index, timeForComputing = 0.1, distancerMode = None, **kwargs):
         super().__init__(index, **kwargs)
 
         # Whether or not you're on the red team
@@ -31,6 +31,11 @@ class CaptureAgent(BaseAgent):
         # Time to spend each turn on computing maze distances
         self.timeForComputing = timeForComputing
 
+        # How the distancer computes maze distances (see `pacai.core.distanceCalculator.Distancer`).
+        # With `pacai.core.distanceCalculator.MODE_INCREMENTAL`, distances are computed
+        # for timeForComputing seconds each turn instead of all at once in registerInitialState.
+        self.distancerMode = distancerMode
+
     def registerInitialState(self, gameState):
         """
         This method handles the initial setup of the agent and populates useful fields,
@@ -38,9 +43,11 @@ class CaptureAgent(BaseAgent):
         """
 
         self.red = gameState.isOnRedTeam(self.index)
-        self.distancer = distanceCalculator.Distancer(gameState.getInitialLayout())
+        self.distancer = distanceCalculator.Distancer(gameState.getInitialLayout(),
+                mode = self.distancerMode)
 
         self.distancer.getMazeDistances()
+        self.distancer.continueComputing(self.timeForComputing)
 
     def final(self, gameState):
         self.observationHistory = []
@@ -64,6 +71,9 @@ class CaptureAgent(BaseAgent):
 
         self.observationHistory.append(gameState)
 
+        if (self.distancer is not None and not self.distancer.isReadyForMazeDistance()):
+            self.distancer.continueComputing(self.timeForComputing)
+
         myState = gameState.getAgentState(self.index)
         myPos = myState.getPosition()
 
@@ -95,6 +105,17 @@ class CaptureAgent(BaseAgent):
         else:
             return gameState.getRedFood()
 
+    def getFoodPositions(self, gameState):
+        """
+        Returns a sorted tuple of the positions (x, y) of the food you're meant to eat.
+        This is the same as `getFood(gameState).asList()`, but does not touch the grid.
+        """
+
+        if (self.red):
+            return gameState.getBlueFoodPositions()
+        else:
+            return gameState.getRedFoodPositions()
+
     def getFoodYouAreDefending(self, gameState):
         """
         Returns the food you're meant to protect (i.e., that your opponent is supposed to eat).
@@ -107,6 +128,16 @@ class CaptureAgent(BaseAgent):
         else:
             return gameState.getBlueFood()
 
+    def getFoodPositionsYouAreDefending(self, gameState):
+        """
+        Returns a sorted tuple of the positions (x, y) of the food you're meant to protect.
+        """
+
+        if (self.red):
+            return gameState.getRedFoodPositions()
+        else:
+            return gameState.getBlueFoodPositions()
+
     def getCapsules(self, gameState):
         if (self.red):
             return gameState.getBlueCapsules()
@@ -160,6 +191,22 @@ class CaptureAgent(BaseAgent):
 
         return self.distancer.getDistance(pos1, pos2)
 
+    def getMazeDistancesFrom(self, source, targets):
+        """
+        Returns a list of the distances from source to each of the targets
+        using the builtin distancer.
+        """
+
+        return self.distancer.getDistances(source, targets)
+
+    def getNearestMazeDistance(self, source, targets):
+        """
+        Returns a tuple of the distance to the closest of the targets and that target
+        using the builtin distancer, or None if there are no targets.
+        """
+
+        return self.distancer.nearest(source, targets)
+
     def getPreviousObservation(self):
         """
         Returns the `pacai.core.gamestate.AbstractGameState` object corresponding to
@@ -16,12 +16,12 @@ class OffensiveReflexAgent(ReflexCaptureAgent):
         features['successorScore'] = self.getScore(successor)
 
         # Compute distance to the nearest food.
-        foodList = self.getFood(successor).asList()
+        foodList = self.getFoodPositions(successor)
 
         # This should always be True, but better safe than sorry.
         if (len(foodList) > 0):
             myPos = successor.getAgentState(self.index).getPosition()
-            minDistance = min([self.getMazeDistance(myPos, food) for food in foodList])
+            minDistance, food = self.getNearestMazeDistance(myPos, foodList)
             features['distanceToFood'] = minDistance
 
         return features
@@ -34,7 +34,7 @@ class ReflexCaptureAgent(CaptureAgent):
         Finds the next successor which is a grid position (location tuple).
         """
 
-        successor = gameState.generateSuccessor(self.index, action)
+        successor = gameState.generateSuccessor(self.index, action, validate = False)
         pos = successor.getAgentState(self.index).getPosition()
 
         if (pos != util.nearestPoint(pos)):
@@ -1,10 +1,12 @@
 import logging
 import time
+import tracemalloc
 from typing import Callable, Union
 
 from pacai.agents.base import BaseAgent
 from pacai.core.directions import Directions
 from pacai.core.gamestate import AbstractGameState
+from pacai.core.search import engine
 from pacai.core.search.heuristic import null as nullHeuristic
 from pacai.core.search.position import PositionSearchProblem
 from pacai.core.search.problem import SearchProblem
@@ -19,15 +21,32 @@ class SearchAgent(BaseAgent):
 
     As a default, this agent runs `pacai.student.search.depthFirstSearch` on a
     `pacai.core.search.position.PositionSearchProblem` to find location (1, 1).
+
+    The search function can be given by its fully qualified name,
+    or by a short name (e.g. 'astar') to use one of the searches in `pacai.core.search.engine`.
+
+    The `pacai.core.search.stats.SearchStats` of the search can be written to statsPath
+    (as CSV if the path ends in '.csv', JSON otherwise).
+    Set traceMemory to also record the peak memory used by the search
+    (this slows the search down).
     """
 
     def __init__(self, index,
             fn: Union[str, Callable[[SearchProblem], any]] = depthFirstSearch,
             prob: Union[str, Callable[[AbstractGameState], SearchProblem]] = PositionSearchProblem,
             heuristic: Union[str, Callable] = nullHeuristic,
+            statsPath: str = None,
+            traceMemory: Union[bool, str] = False,
             **kwargs):
         super().__init__(index, **kwargs)
 
+        self._functionName = fn
+        if (not isinstance(fn, str)):
+            self._functionName = getattr(fn, '__name__', str(fn))
+
+        self._statsPath = statsPath
+        self._traceMemory = (str(traceMemory).lower() in ('1', 'true', 'yes'))
+
         if isinstance(prob, str):
             # Get the search problem type from the name.
             self.searchType = reflection.qualifiedImport(prob)
@@ -65,9 +84,26 @@ class SearchAgent(BaseAgent):
         starttime = time.time()
         problem = self.searchType(state)  # Makes a new search problem.
 
-        self._actions = self.searchFunction(problem)  # Find a path.
+        startedTracing = (self._traceMemory and not tracemalloc.is_tracing())
+        if (startedTracing):
+            tracemalloc.start()
+        elif (self._traceMemory and hasattr(tracemalloc, 'reset_peak')):
+            tracemalloc.reset_peak()
+
+        searchStartTime = time.perf_counter()
+        self._actions = problem.expandActions(self.searchFunction(problem))  # Find a path.
+        searchTime = time.perf_counter() - searchStartTime
+
         self._actionIndex = 0
 
+        stats = problem.getStats()
+        stats.wallTime = searchTime
+
+        if (self._traceMemory):
+            stats.peakMemory = tracemalloc.get_traced_memory()[1]
+            if (startedTracing):
+                tracemalloc.stop()
+
         totalCost = problem.actionsCost(self._actions)
 
         state.setHighlightLocations(problem.getVisitHistory())
@@ -77,6 +113,16 @@ class SearchAgent(BaseAgent):
 
         logging.info('Search nodes expanded: %d' % problem.getExpandedCount())
 
+        stats.problem = type(problem).__name__
+        stats.function = self._functionName
+        stats.expanded = problem.getExpandedCount()
+        stats.pathCost = totalCost
+        if (self._actions is not None):
+            stats.pathLength = len(self._actions)
+
+        if (self._statsPath is not None):
+            self._writeStats(stats)
+
     def getAction(self, state):
         """
         Returns the next action in the path chosen earlier (in registerInitialState).
@@ -91,15 +137,27 @@ class SearchAgent(BaseAgent):
 
         return action
 
+    def _writeStats(self, stats):
+        if (self._statsPath.lower().endswith('.csv')):
+            stats.writeCSV(self._statsPath)
+        else:
+            stats.writeJSON(self._statsPath)
+
+        logging.info('Search stats written to %s.' % (self._statsPath))
+
     def _fetchSearchFunction(self, functionName: str, heuristic: Union[str, Callable]):
         """
         Get the specified search function by name.
+        Short names (see `pacai.core.search.engine.SEARCH_FUNCTIONS`) select a library search.
         If that function also takes a heurisitc (i.e. has a parameter called "heuristic"),
         then return a lambda that binds the heuristic to the function.
         """
 
         # Locate the function.
-        function = reflection.qualifiedImport(functionName)
+        if (functionName in engine.SEARCH_FUNCTIONS):
+            function = engine.SEARCH_FUNCTIONS[functionName]
+        else:
+            function = reflection.qualifiedImport(functionName)
 
         # Check if the function has a heuristic.
         if 'heuristic' not in function.__code__.co_varnames:
@@ -1,16 +1,47 @@
 from pacai.agents.search.base import SearchAgent
+from pacai.core.search import engine
 from pacai.core.search import search
 from pacai.core.search.food import FoodSearchProblem
 from pacai.student import searchAgents
+from pacai.util import reflection
+
+# The memory-bounded searches that can be used instead of A*.
+MEMORY_BOUNDED_SEARCHES = {
+    'idastar': engine.idastar,
+    'smastar': engine.smastar,
+}
 
 class AStarFoodSearchAgent(SearchAgent):
     """
     A search agent for `pacai.core.search.food.FoodSearchProblem using A*
     and `pacai.student.searchAgents.foodHeuristic`.
+
+    Food search states can be large,
+    so for big layouts a memory-bounded version of A* can be used instead
+    by setting algorithm to 'idastar' or 'smastar' (see `pacai.core.search.engine`).
+    maxNodes is then the most search states they may keep in memory.
+
+    A different heuristic can be given by its fully qualified name,
+    e.g. `pacai.core.search.heuristic.foodMST`.
     """
 
-    def __init__(self, index, **kwargs):
+    def __init__(self, index, algorithm = 'astar', maxNodes = engine.DEFAULT_MAX_NODES,
+            heuristic = searchAgents.foodHeuristic, **kwargs):
+        if (isinstance(heuristic, str)):
+            heuristic = reflection.qualifiedImport(heuristic)
+
+        if (algorithm == 'astar'):
+            fn = lambda prob: search.astar(prob, heuristic)
+        elif (algorithm in MEMORY_BOUNDED_SEARCHES):
+            function = MEMORY_BOUNDED_SEARCHES[algorithm]
+            maxNodes = int(maxNodes)
+            fn = lambda prob: function(prob, heuristic, maxNodes = maxNodes)
+        else:
+            raise ValueError('Unknown food search algorithm: %s.' % (algorithm))
+
         super().__init__(index,
-                         fn = lambda prob: search.astar(prob, searchAgents.foodHeuristic),
+                         fn = fn,
                          prob = FoodSearchProblem,
                          **kwargs)
+
+        self._functionName = algorithm
@@ -68,6 +68,11 @@ def getParser(description, name):
             action = 'store', type = str, default = view.DEFAULT_SPRITES,
             help = 'use the specified spritesheet for graphics (default: %(default)s)')
 
+    parser.add_argument('--validate-actions', dest = 'validateActions',
+            action = 'store_true', default = False,
+            help = 'always check that actions are legal, even when agents ask to skip the check '
+                + '(default: %(default)s)')
+
     parser.add_argument('--text-graphics', dest = 'textGraphics',
             action = 'store_true', default = False,
             help = 'display output as text only (default: %(default)s)')
@@ -6,6 +6,7 @@ On your opponents side of the map, you are a pacman and can eat food and capsule
 """
 
 import logging
+import operator
 import os
 import pickle
 import random
@@ -15,6 +16,7 @@ from pacai.agents import keyboard
 from pacai.agents.capture.dummy import DummyAgent
 from pacai.bin.arguments import getParser
 from pacai.core.actions import Actions
+from pacai.core import distanceCalculator
 from pacai.core.distance import manhattan
 from pacai.core.game import Game
 from pacai.core.gamestate import AbstractGameState
@@ -43,6 +45,14 @@ class CaptureGameState(AbstractGameState):
     A game state specific to capture.
     """
 
+    _MOVE_FIELDS = AbstractGameState._MOVE_FIELDS + ('_timeleft',)
+    _BOARD_FIELDS = AbstractGameState._BOARD_FIELDS + ('_redCapsules', '_blueCapsules',
+            '_redFood', '_blueFood', '_numRedFood', '_numBlueFood',
+            '_redFoodPositions', '_blueFoodPositions')
+
+    _getMoveFields = operator.attrgetter(*_MOVE_FIELDS)
+    _getBoardFields = operator.attrgetter(*_BOARD_FIELDS)
+
     def __init__(self, layout, timeleft):
         super().__init__(layout)
 
@@ -78,27 +88,32 @@ class CaptureGameState(AbstractGameState):
             else:
                 self._blueCapsules.append(capsule)
 
-        self._redFood = Grid(self._food.getWidth(), self._food.getHeight(), initialValue = False)
-        self._blueFood = Grid(self._food.getWidth(), self._food.getHeight(), initialValue = False)
+        redFood = Grid(self._food.getWidth(), self._food.getHeight(), initialValue = False)
+        blueFood = Grid(self._food.getWidth(), self._food.getHeight(), initialValue = False)
+
+        for (x, y) in self._food.asList():
+            if (self.isOnRedSide((x, y))):
+                redFood[x][y] = True
+            else:
+                blueFood[x][y] = True
+
+        self._redFood = redFood.freeze()
+        self._blueFood = blueFood.freeze()
 
-        for x in range(self._food.getWidth()):
-            for y in range(self._food.getHeight()):
-                if (not self._food[x][y]):
-                    continue
+        self._numRedFood = self._redFood.count()
+        self._numBlueFood = self._blueFood.count()
 
-                if (self.isOnRedSide((x, y))):
-                    self._redFood[x][y] = True
-                else:
-                    self._blueFood[x][y] = True
+        self._redFoodPositions = tuple(self._redFood.asList())
+        self._blueFoodPositions = tuple(self._blueFood.asList())
 
     # Override
-    def generateSuccessor(self, agentIndex, action):
+    def generateSuccessor(self, agentIndex, action, validate = True):
         # Check that successors exist.
         if (self.isOver()):
             raise RuntimeError("Can't generate successors of a terminal state.")
 
         successor = self._initSuccessor()
-        successor._applySuccessorAction(agentIndex, action)
+        successor._applySuccessorAction(agentIndex, action, validate)
 
         return successor
 
@@ -111,6 +126,8 @@ class CaptureGameState(AbstractGameState):
 
     # Override
     def eatCapsule(self, x, y):
+        self._saveBoard()
+
         if (not self._capsulesCopied):
             self._redCapsules = self._redCapsules.copy()
             self._blueCapsules = self._blueCapsules.copy()
@@ -124,16 +141,21 @@ class CaptureGameState(AbstractGameState):
 
     # Override
     def eatFood(self, x, y):
-        if (not self._foodCopied):
-            self._redFood = self._redFood.copy()
-            self._blueFood = self._blueFood.copy()
+        if (not self.hasFood(x, y)):
+            return False
 
         super().eatFood(x, y)
 
         if (self.isOnRedSide((x, y))):
-            self._redFood[x][y] = False
+            self._redFood = self._redFood.updated(x, y, False)
+            self._numRedFood -= 1
+            self._redFoodPositions = self._removePosition(self._redFoodPositions, (x, y))
         else:
-            self._blueFood[x][y] = False
+            self._blueFood = self._blueFood.updated(x, y, False)
+            self._numBlueFood -= 1
+            self._blueFoodPositions = self._removePosition(self._blueFoodPositions, (x, y))
+
+        return True
 
     def getBlueCapsules(self):
         """
@@ -148,11 +170,25 @@ class CaptureGameState(AbstractGameState):
         Returns a grid of food that corresponds to the food on the blue team's side.
         For the grid g, g[x][y] = True if there is food in (x, y) that belongs to
         blue (meaning blue is protecting it, red is trying to eat it).
-        The caller should not modify the grid.
+        The grid is a read-only `pacai.core.grid.FrozenGrid`.
         """
 
         return self._blueFood
 
+    def getBlueFoodPositions(self):
+        """
+        Returns a sorted tuple of the positions (x, y) of the remaining food on the blue side.
+        """
+
+        return self._blueFoodPositions
+
+    def getNumBlueFood(self):
+        """
+        Get the amount of food left on the blue side.
+        """
+
+        return self._numBlueFood
+
     def getBlueTeamIndices(self):
         """
         Returns a list of the agent index numbers for the agents on the blue team.
@@ -174,11 +210,25 @@ class CaptureGameState(AbstractGameState):
         Returns a grid of food that corresponds to the food on the red team's side.
         For the grid g, g[x][y] = True if there is food in (x, y) that belongs to
         red (meaning red is protecting it, blue is trying to eat it).
-        The caller should not modify the grid.
+        The grid is a read-only `pacai.core.grid.FrozenGrid`.
         """
 
         return self._redFood
 
+    def getRedFoodPositions(self):
+        """
+        Returns a sorted tuple of the positions (x, y) of the remaining food on the red side.
+        """
+
+        return self._redFoodPositions
+
+    def getNumRedFood(self):
+        """
+        Get the amount of food left on the red side.
+        """
+
+        return self._numRedFood
+
     def getRedTeamIndices(self):
         """
         Returns a list of agent index numbers for the agents on the red team.
@@ -224,15 +274,15 @@ class CaptureGameState(AbstractGameState):
 
         return self._teams[agentIndex]
 
-    def _applySuccessorAction(self, agentIndex, action):
+    def _applySuccessorAction(self, agentIndex, action, validate = True):
         """
         Apply the action to the context state (self).
         """
 
         # Find appropriate rules for the agent.
-        AgentRules.applyAction(self, action, agentIndex)
+        AgentRules.applyAction(self, action, agentIndex, self._shouldValidate(validate))
         AgentRules.checkDeath(self, agentIndex)
-        AgentRules.decrementTimer(self.getAgentState(agentIndex))
+        AgentRules.decrementTimer(self.getMutableAgentState(agentIndex))
 
         # Book keeping.
         self._lastAgentMoved = agentIndex
@@ -255,8 +305,8 @@ class CaptureRules:
         game.state = initState
         game.length = length
 
-        self._totalBlueFood = initState.getBlueFood().count()
-        self._totalRedFood = initState.getRedFood().count()
+        self._totalBlueFood = initState.getNumBlueFood()
+        self._totalRedFood = initState.getNumRedFood()
 
         return game
 
@@ -279,10 +329,10 @@ class CaptureRules:
         redWin = False
         blueWin = False
 
-        if (state.getRedFood().count() <= MIN_FOOD):
+        if (state.getNumRedFood() <= MIN_FOOD):
             logging.info("The Blue team ate all but %d of the opponents' dots." % MIN_FOOD)
             blueWin = True
-        elif (state.getBlueFood().count() <= MIN_FOOD):
+        elif (state.getNumBlueFood() <= MIN_FOOD):
             logging.info("The Red team ate all but %d of the opponents' dots." % MIN_FOOD)
             redWin = True
         else:
@@ -342,20 +392,25 @@ class AgentRules:
         """
 
         agentState = state.getAgentState(agentIndex)
-        return Actions.getPossibleActions(agentState.getPosition(), agentState.getDirection(),
-                state.getWalls())
+        position = agentState.getPosition()
+
+        actions = state.getInitialLayout().getPossibleActions(position)
+        if (actions is not None):
+            return list(actions)
+
+        return Actions.getPossibleActions(position, agentState.getDirection(), state.getWalls())
 
     @staticmethod
-    def applyAction(state, action, agentIndex):
+    def applyAction(state, action, agentIndex, validate = True):
         """
         Edits the state to reflect the results of the action.
+        The action is only checked for legality if validate is set.
         """
 
-        legal = AgentRules.getLegalActions(state, agentIndex)
-        if (action not in legal):
+        if (validate and action not in AgentRules.getLegalActions(state, agentIndex)):
             raise ValueError('Illegal action: ' + str(action))
 
-        agentState = state.getAgentState(agentIndex)
+        agentState = state.getMutableAgentState(agentIndex)
 
         # Update position.
         vector = Actions.directionToVector(action, AgentRules.AGENT_SPEED)
@@ -392,8 +447,8 @@ class AgentRules:
             else:
                 state.addScore(-FOOD_POINTS)
 
-            if ((isRed and state.getBlueFood().count() <= MIN_FOOD)
-                    or (not isRed and state.getRedFood().count() <= MIN_FOOD)):
+            if ((isRed and state.getNumBlueFood() <= MIN_FOOD)
+                    or (not isRed and state.getNumRedFood() <= MIN_FOOD)):
                 state.endGame(True)
 
             return
@@ -414,7 +469,7 @@ class AgentRules:
                 otherTeam = state.getRedTeamIndices()
 
             for agentIndex in otherTeam:
-                state.getAgentState(agentIndex).setScaredTimer(SCARED_TIME)
+                state.getMutableAgentState(agentIndex).setScaredTimer(SCARED_TIME)
 
     @staticmethod
     def decrementTimer(agentState):
@@ -455,9 +510,10 @@ class AgentRules:
             # Otherwise, we are being eatten.
             if (agentState.isBraveGhost() or otherAgentState.isScaredGhost()):
                 state.addScore(teamPointModifier * KILL_POINTS)
-                otherAgentState.respawn()
+                state.getMutableAgentState(otherAgentIndex).respawn()
             else:
                 state.addScore(teamPointModifier * -KILL_POINTS)
+                agentState = state.getMutableAgentState(agentIndex)
                 agentState.respawn()
 
 #############################
@@ -519,6 +575,11 @@ def readCommand(argv):
             help = 'comma separated arguments to be passed to blue team (e.g. \'opt1=val1,opt2\') '
                 + '(default: %(default)s)')
 
+    parser.add_argument('--distance-cache', dest = 'distanceCache',
+            action = 'store', type = str, default = None,
+            help = 'save the maze distances that agents compute in this directory, '
+                + 'and reuse them in later games on the same walls (default: %(default)s)')
+
     parser.add_argument('--keys0', dest = 'keys0',
             action = 'store_true', default = False,
             help = 'make agent 0 (first red player) a keyboard agent (default: %(default)s)')
@@ -559,6 +620,9 @@ def readCommand(argv):
     elif options.debug:
         updateLoggingLevel(logging.DEBUG)
 
+    AbstractGameState.setForceValidation(options.validateActions)
+    distanceCalculator.setCacheDir(options.distanceCache)
+
     viewOptions = {
         'gifFPS': options.gifFPS,
         'gifPath': options.gif,
@@ -71,6 +71,24 @@ class Actions:
 
         return possible
 
+    @staticmethod
+    def getPossibleGhostActions(position, direction, walls):
+        """
+        Ghosts cannot stop, and cannot turn around unless they
+        reach a dead end, but can turn 90 degrees at intersections.
+        """
+
+        possible = Actions.getPossibleActions(position, direction, walls)
+        reverse = Actions.reverseDirection(direction)
+
+        if (Directions.STOP in possible):
+            possible.remove(Directions.STOP)
+
+        if (reverse in possible and len(possible) > 1):
+            possible.remove(reverse)
+
+        return possible
+
     @staticmethod
     def getLegalNeighbors(position, walls):
         x, y = position
@@ -9,8 +9,14 @@ class AgentState:
     The convention for positions, like a graph, is that (0, 0) is the lower left corner,
     x increases horizontally and y increases vertically.
     Therefore, north is the direction of increasing y, or (0, 1).
+
+    Agent states are shared between game states until one of them needs to modify it
+    (see `pacai.core.gamestate.AbstractGameState.getMutableAgentState`).
     """
 
+    __slots__ = ('_startPosition', '_startDirection', '_startIsPacman',
+            '_position', '_direction', '_isPacman', '_scaredTimer', '_hash')
+
     def __init__(self, position, direction, isPacman):
         # Save the starting information for later use.
         self._startPosition = position
@@ -23,6 +29,10 @@ class AgentState:
         self._isPacman = isPacman
         self._scaredTimer = 0
 
+        # A cached hash code.
+        # Anything that modifies this state should clear it.
+        self._hash = None
+
     def copy(self):
         state = AgentState(self._startPosition, self._startDirection, self._startIsPacman)
 
@@ -30,11 +40,13 @@ class AgentState:
         state._position = self._position
         state._direction = self._direction
         state._scaredTimer = self._scaredTimer
+        state._hash = self._hash
 
         return state
 
     def decrementScaredTimer(self):
         self._scaredTimer = max(0, self._scaredTimer - 1)
+        self._hash = None
 
     def getDirection(self):
         return self._direction
@@ -69,9 +81,11 @@ class AgentState:
 
     def setIsPacman(self, isPacman):
         self._isPacman = isPacman
+        self._hash = None
 
     def setScaredTimer(self, timer):
         self._scaredTimer = timer
+        self._hash = None
 
     def snapToNearestPoint(self):
         """
@@ -79,6 +93,7 @@ class AgentState:
         """
 
         self._position = util.nearestPoint(self._position)
+        self._hash = None
 
     def respawn(self):
         """
@@ -89,6 +104,7 @@ class AgentState:
         self._direction = self._startDirection
         self._isPacman = self._startIsPacman
         self._scaredTimer = 0
+        self._hash = None
 
     def updatePosition(self, vector):
         """
@@ -105,6 +121,8 @@ class AgentState:
             # If this is a zero vector, face the same direction as before.
             self._direction = direction
 
+        self._hash = None
+
     def __eq__(self, other):
         if (other is None):
             return False
@@ -115,7 +133,11 @@ class AgentState:
                 and self._scaredTimer == other._scaredTimer)
 
     def __hash__(self):
-        return util.buildHash(self._position, self._direction, self._isPacman, self._scaredTimer)
+        if (self._hash is None):
+            self._hash = util.buildHash(self._position, self._direction, self._isPacman,
+                    self._scaredTimer)
+
+        return self._hash
 
     def __str__(self):
         typeString = 'Ghost'
@@ -127,4 +149,4 @@ class AgentState:
             scaredString = '!'
 
         return "%s%s: Position: %s, Direction: %s" % (typeString, scaredString,
-                str(self._position), str(self.direction))
+                str(self._position), str(self._direction))
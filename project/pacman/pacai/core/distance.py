@@ -17,14 +17,24 @@ def euclidean(position1, position2):
 
 def maze(position1, position2, gameState):
     """
-    Returns the maze distance between any two positions,
-    using the search functions you have already built.
+    Returns the maze distance between any two positions.
+
+    Distances between open cells come from a cache shared by every call on the same walls
+    (see `pacai.core.distanceCalculator.getMazeOracle`).
+    Other positions use the search functions you have already built.
 
     WARNING: `pacai.student.search.breadthFirstSearch` must already be implemted.
 
     Example usage: `distance.maze((2, 4), (5, 6), gameState)`.
     """
 
+    # Imported here since the distance calculator itself uses this module.
+    from pacai.core.distanceCalculator import getMazeOracle
+
+    distance = getMazeOracle(gameState.getWalls()).getDistance(position1, position2)
+    if (distance is not None):
+        return distance
+
     x1, y1 = position1
     x2, y2 = position2
 
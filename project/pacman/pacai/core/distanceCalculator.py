@@ -1,10 +1,52 @@
+import array
+import collections
+import hashlib
+import logging
+import mmap
+import os
+import struct
 import sys
+import tempfile
+import time
 
 from pacai.core.distance import manhattan
-from pacai.util import priorityQueue
+from pacai.core.layoutgraph import LayoutGraph
 
 DEFAULT_DISTANCE = 10000
 
+# The value stored in a distance table for cells that cannot reach each other.
+UNREACHABLE = -1
+
+# Cached distance files start with: magic, format version, byte order, typecode, number of cells.
+CACHE_MAGIC = b'PACD'
+CACHE_VERSION = 1
+CACHE_HEADER = struct.Struct('<4sBcc x I')
+CACHE_EXTENSION = '.dist'
+
+# Where computed distance tables are saved (see setCacheDir()), None disables the disk cache.
+_cacheDir = None
+
+# The default memory budget for the distance tables shared within a process.
+DEFAULT_REGISTRY_BYTES = 64 * 1024 * 1024
+
+# Distancer modes: compute every distance up front, one source at a time as it is queried,
+# or a little at a time (see Distancer.continueComputing()).
+MODE_FULL = 'full'
+MODE_LAZY = 'lazy'
+MODE_INCREMENTAL = 'incremental'
+
+# Layouts with more open cells than this use the lazy mode by default (see chooseMode()).
+MAX_FULL_TABLE_CELLS = 2500
+
+# The default number of rows a lazy table keeps.
+DEFAULT_LAZY_ROWS = 1024
+
+# The most walls that maze oracles are kept for (see getMazeOracle()).
+MAX_MAZE_ORACLES = 16
+
+# The maze oracles, keyed by (frozen) walls.
+_mazeOracles = collections.OrderedDict()
+
 class Distancer(object):
     """
     A class for computing and caching the shortest path between any two points in a given maze.
@@ -14,11 +56,41 @@ class Distancer(object):
     distancer = Distancer(gameState.getInitialLayout())
     distancer.getDistance((1, 1), (10, 10))
     ```
+
+    The distances themselves are shared by all distancers on the same walls,
+    see `DistanceRegistry`.
+
+    By default, the distances between all cells are computed by getMazeDistances().
+    On very large layouts (see `chooseMode`), the distances from each cell are instead computed
+    the first time that cell is queried and kept in a bounded cache, see `LazyDistanceTable`.
+    Pass MODE_FULL or MODE_LAZY as the mode to pick one explicitly.
+
+    In MODE_INCREMENTAL, getMazeDistances() returns right away
+    and the distances are computed in slices by continueComputing(), see `IncrementalDistanceTable`.
+    Until then, distances that are not known yet are manhattan distances.
     """
 
-    def __init__(self, layout):
+    def __init__(self, layout, mode = None):
         self._distances = None
-        self.dc = DistanceCalculator(layout, self)
+        self.dc = DistanceCalculator(layout, self, mode)
+
+    def continueComputing(self, seconds):
+        """
+        Spend about the given number of seconds computing distances (for MODE_INCREMENTAL).
+        Returns True when all distances are known.
+        """
+
+        if (self._distances is None):
+            return False
+
+        if (not isinstance(self._distances, IncrementalDistanceTable)):
+            return True
+
+        if (not self._distances.compute(seconds)):
+            return False
+
+        self._distances = _registry.finish(self.dc.layout, self._distances)
+        return True
 
     def getMazeDistances(self):
         self.dc.run()
@@ -48,14 +120,77 @@ class Distancer(object):
         return bestDistance
 
     def getDistanceOnGrid(self, pos1, pos2):
-        key = (pos1, pos2)
-        if key in self._distances:
-            return self._distances[key]
+        distance = self._distances.getDistance(pos1, pos2)
+        if (distance is None):
+            raise Exception("Position not in grid: " + str((pos1, pos2)))
+
+        return distance
+
+    def getDistances(self, source, targets):
+        """
+        Get a list of the maze distances from source to each of the targets.
+
+        When source is an open cell, this is a single row lookup in the distance table.
+        If the distances have not been computed yet (see getMazeDistances()),
+        then a BFS from the source is run instead, so the result is always exact.
+        """
+
+        targets = list(targets)
+
+        graph = self.dc.layout.getGraph()
+        sourceId = graph.getCellId(source)
+        targetIds = [graph.getCellId(target) for target in targets]
+
+        if (sourceId is None or None in targetIds):
+            return [self.getDistance(source, target) for target in targets]
+
+        if (self._distances is not None):
+            row = self._distances.getRow(sourceId)
+        else:
+            row = _bfsToTargets(graph.getAdjacency(), sourceId, targetIds)
+
+        return _lookupDistances(row, targetIds)
+
+    def nearest(self, source, targets):
+        """
+        Get the closest of the targets to source (by maze distance) as a (distance, target) tuple.
+        Ties go to the target that comes first.
+        Returns None if there are no targets.
+
+        See getDistances() for how the distances are found.
+        """
+
+        targets = list(targets)
+        if (len(targets) == 0):
+            return None
+
+        graph = self.dc.layout.getGraph()
+        sourceId = graph.getCellId(source)
+        targetIds = [graph.getCellId(target) for target in targets]
+
+        if (self._distances is None and sourceId is not None and None not in targetIds):
+            # No table, stop the search as soon as any target is found.
+            row = _bfsToTargets(graph.getAdjacency(), sourceId, targetIds, stopAtFirst = True)
+            distances = _lookupDistances(row, targetIds)
+        else:
+            distances = self.getDistances(source, targets)
+
+        distance = min(distances)
+        return (distance, targets[distances.index(distance)])
+
+    def getStats(self):
+        """
+        Get the cache statistics of a lazy distancer (see `LazyDistanceTable.getStats`).
+        Returns None if the distances are not lazy (or not ready).
+        """
 
-        raise Exception("Position not in grid: " + str(key))
+        if (not isinstance(self._distances, LazyDistanceTable)):
+            return None
+
+        return self._distances.getStats()
 
     def isReadyForMazeDistance(self):
-        return (self._distances is not None)
+        return (self._distances is not None and self._distances.isComplete())
 
 def isInt(pos):
     x, y = pos
@@ -78,79 +213,670 @@ def getGrids1D(x):
 # MACHINERY FOR COMPUTING MAZE DISTANCES #
 ##########################################
 
-distanceMap = {}
-
 class DistanceCalculator:
-    def __init__(self, layout, distancer):
+    def __init__(self, layout, distancer, mode = None):
         self.layout = layout
         self.distancer = distancer
-        self.cache = {}
+        self.mode = mode
 
     def run(self):
-        if self.layout.walls not in self.cache:
-            self.cache[self.layout.walls] = computeDistances(self.layout)
+        self.distancer._distances = _registry.getTable(self.layout, self.mode)
+
+class DistanceRegistry(object):
+    """
+    The distance tables shared by every `Distancer` in this process, keyed by the walls of their
+    layout (see `wallsDigest`).
+    So all the agents in a game (and later games on the same walls) compute each table once.
+
+    When the tables take up more than maxBytes, the least recently used ones are dropped
+    (the most recently used table is always kept).
+    Use `getRegistry` to get the registry for this process.
+    """
+
+    def __init__(self, maxBytes = DEFAULT_REGISTRY_BYTES):
+        self._maxBytes = maxBytes
+        self._tables = collections.OrderedDict()
+        self._size = 0
+
+    def clear(self):
+        self._tables.clear()
+        self._size = 0
+
+    def getMaxBytes(self):
+        return self._maxBytes
+
+    def getSize(self):
+        """
+        Get the number of bytes used by the tables in this registry.
+        """
+
+        return self._size
+
+    def finish(self, layout, table):
+        """
+        Replace a complete `IncrementalDistanceTable` for the layout with a full `DistanceTable`
+        (which is also saved to the disk cache, if enabled), and return the full table.
+        """
+
+        digest = wallsDigest(layout.walls)
+
+        key = (digest, MODE_INCREMENTAL)
+        if (self._tables.get(key) is table):
+            del self._tables[key]
+            self._size -= table.getSize()
+
+        fullTable = self._get((digest, MODE_FULL))
+        if (fullTable is not None):
+            return fullTable
+
+        fullTable = table.toTable()
+        _saveCachedDistances(layout, fullTable)
+
+        self._put((digest, MODE_FULL), fullTable)
+        return fullTable
+
+    def getTable(self, layout, mode = None):
+        """
+        Get the `DistanceTable` for the layout, loading or computing it if necessary.
+        If no mode is given, one is picked with `chooseMode`.
+        """
+
+        if (mode is None):
+            mode = chooseMode(layout)
+
+        digest = wallsDigest(layout.walls)
+
+        # A full table is just as good as an incremental one.
+        if (mode == MODE_INCREMENTAL):
+            table = self._get((digest, MODE_FULL))
+            if (table is not None):
+                return table
+
+        table = self._get((digest, mode))
+        if (table is not None):
+            return table
+
+        if (mode == MODE_FULL):
+            table = _getDistanceTable(layout)
+        elif (mode == MODE_LAZY):
+            table = LazyDistanceTable(layout.getGraph())
+        elif (mode == MODE_INCREMENTAL):
+            table = _loadCachedDistances(layout)
+            if (table is not None):
+                mode = MODE_FULL
+            else:
+                table = IncrementalDistanceTable(layout.getGraph())
+        else:
+            raise ValueError('Unknown distancer mode: ' + str(mode))
+
+        self._put((digest, mode), table)
+        return table
+
+    def setMaxBytes(self, maxBytes):
+        self._maxBytes = maxBytes
+        self._evict()
+
+    def __contains__(self, layout):
+        digest = wallsDigest(layout.walls)
+        return any(key[0] == digest for key in self._tables)
+
+    def __len__(self):
+        return len(self._tables)
+
+    def _evict(self):
+        while (self._size > self._maxBytes and len(self._tables) > 1):
+            key, table = self._tables.popitem(last = False)
+            self._size -= table.getSize()
+
+    def _get(self, key):
+        table = self._tables.get(key)
+        if (table is not None):
+            self._tables.move_to_end(key)
+
+        return table
+
+    def _put(self, key, table):
+        self._tables[key] = table
+        self._size += table.getSize()
+        self._evict()
+
+_registry = DistanceRegistry()
+
+def getRegistry():
+    """
+    Get the `DistanceRegistry` shared by this process.
+    """
+
+    return _registry
+
+class DistanceTable(object):
+    """
+    The maze distance between every pair of open cells in a layout.
+
+    Distances are kept in a single dense row-major matrix indexed by
+    `pacai.core.layoutgraph.LayoutGraph` cell ids,
+    so a lookup is two id lookups and an index into a flat array.
+    """
+
+    def __init__(self, graph, distances):
+        self._graph = graph
+        self._numCells = graph.getNumCells()
+        self._distances = distances
+
+    def getDistance(self, pos1, pos2):
+        """
+        Get the maze distance between two open cells with integer coordinates.
+        Returns None if either position is not an open cell.
+        Cells that cannot reach each other are sys.maxsize apart.
+        """
+
+        id1 = self._graph.getCellId(pos1)
+        id2 = self._graph.getCellId(pos2)
+        if (id1 is None or id2 is None):
+            return None
+
+        return self.getDistanceById(id1, id2)
+
+    def getDistanceById(self, id1, id2):
+        distance = self._distances[id1 * self._numCells + id2]
+        if (distance == UNREACHABLE):
+            return sys.maxsize
+
+        return distance
+
+    def getGraph(self):
+        return self._graph
+
+    def getRow(self, cellId):
+        """
+        Get the distances (indexed by cell id) from the given cell to every cell.
+        Unreachable cells have a distance of UNREACHABLE.
+        """
+
+        start = cellId * self._numCells
+        return self._distances[start:start + self._numCells]
+
+    def getSize(self):
+        """
+        Get the number of bytes used to store the distances.
+        """
+
+        return len(self._distances) * self._distances.itemsize
+
+    def isComplete(self):
+        """
+        Whether every distance this table gives is exact.
+        """
+
+        return True
+
+    def __contains__(self, key):
+        return self.getDistance(*key) is not None
+
+    def __getitem__(self, key):
+        distance = self.getDistance(*key)
+        if (distance is None):
+            raise KeyError(key)
+
+        return distance
+
+    def __len__(self):
+        return self._numCells * self._numCells
+
+class LazyDistanceTable(DistanceTable):
+    """
+    A `DistanceTable` that runs a BFS from a cell the first time a distance from
+    (or to) that cell is needed.
+    At most maxRows rows of distances are kept, the least recently used rows are dropped.
+    """
+
+    def __init__(self, graph, maxRows = DEFAULT_LAZY_ROWS):
+        numCells = graph.getNumCells()
+
+        super().__init__(graph, None)
+
+        self._maxRows = max(1, maxRows)
+        self._rows = collections.OrderedDict()
+        self._adjacency = graph.getAdjacency()
+
+        self._typecode = 'h'
+        if (numCells >= 2 ** 15):
+            self._typecode = 'i'
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def getDistanceById(self, id1, id2):
+        rows = self._rows
+
+        # Distances are symmetric, so a row for either cell will do.
+        if (id1 in rows):
+            self._hits += 1
+            rows.move_to_end(id1)
+            distance = rows[id1][id2]
+        elif (id2 in rows):
+            self._hits += 1
+            rows.move_to_end(id2)
+            distance = rows[id2][id1]
+        else:
+            self._misses += 1
+            distance = self._computeRow(id1)[id2]
 
-        self.distancer._distances = self.cache[self.layout.walls]
+        if (distance == UNREACHABLE):
+            return sys.maxsize
+
+        return distance
+
+    def getRow(self, cellId):
+        row = self._rows.get(cellId)
+        if (row is None):
+            self._misses += 1
+            return self._computeRow(cellId)
+
+        self._hits += 1
+        self._rows.move_to_end(cellId)
+        return row
+
+    def getSize(self):
+        """
+        Get the most bytes this table will use to store distances.
+        """
+
+        return self._maxRows * self._numCells * array.array(self._typecode).itemsize
+
+    def getStats(self):
+        """
+        Get a dict with the number of lookups that found their row (hits),
+        the number that had to compute it (misses),
+        the number of rows dropped to stay under maxRows (evictions),
+        and the number of rows currently kept (rows).
+        """
+
+        return {
+            'hits': self._hits,
+            'misses': self._misses,
+            'evictions': self._evictions,
+            'rows': len(self._rows),
+        }
+
+    def _computeRow(self, source):
+        row = _bfs(self._adjacency, source, self._typecode)
+
+        self._rows[source] = row
+        if (len(self._rows) > self._maxRows):
+            self._rows.popitem(last = False)
+            self._evictions += 1
+
+        return row
+
+class IncrementalDistanceTable(DistanceTable):
+    """
+    A `DistanceTable` that is filled one BFS row at a time by compute(),
+    so the work can be spread over several turns.
+
+    Distances involving a cell whose row is known are exact,
+    all other distances are manhattan distances (which never overestimate).
+    Rows requested with getRow() are computed right away.
+    Once every row is known, toTable() gives the equivalent full `DistanceTable`.
+    """
+
+    def __init__(self, graph):
+        numCells = graph.getNumCells()
+
+        super().__init__(graph, None)
+
+        self._rows = [None] * numCells
+        self._numRows = 0
+        self._nextSource = 0
+        self._adjacency = graph.getAdjacency()
+
+        self._typecode = 'h'
+        if (numCells >= 2 ** 15):
+            self._typecode = 'i'
+
+    def compute(self, seconds):
+        """
+        Compute rows for about the given number of seconds (but always at least one row).
+        Returns True when all rows are known.
+        """
+
+        deadline = time.time() + seconds
+
+        while (not self.isComplete()):
+            if (self._rows[self._nextSource] is None):
+                self._computeRow(self._nextSource)
+
+            self._nextSource += 1
+
+            if (time.time() >= deadline):
+                break
+
+        return self.isComplete()
+
+    def getDistanceById(self, id1, id2):
+        if (self._rows[id1] is not None):
+            distance = self._rows[id1][id2]
+        elif (self._rows[id2] is not None):
+            distance = self._rows[id2][id1]
+        else:
+            return manhattan(self._graph.getPosition(id1), self._graph.getPosition(id2))
+
+        if (distance == UNREACHABLE):
+            return sys.maxsize
+
+        return distance
+
+    def getProgress(self):
+        """
+        Get the fraction of rows that are known.
+        """
+
+        if (self._numCells == 0):
+            return 1.0
+
+        return self._numRows / self._numCells
+
+    def getRow(self, cellId):
+        row = self._rows[cellId]
+        if (row is None):
+            row = self._computeRow(cellId)
+
+        return row
+
+    def getSize(self):
+        """
+        Get the number of bytes this table will use once it is complete.
+        """
+
+        return self._numCells * self._numCells * array.array(self._typecode).itemsize
+
+    def isComplete(self):
+        return (self._numRows == self._numCells)
+
+    def toTable(self):
+        if (not self.isComplete()):
+            raise ValueError('Not all distances have been computed.')
+
+        distances = array.array(self._typecode)
+        for row in self._rows:
+            distances.extend(row)
+
+        return DistanceTable(self._graph, distances)
+
+    def _computeRow(self, source):
+        row = _bfs(self._adjacency, source, self._typecode)
+
+        self._rows[source] = row
+        self._numRows += 1
+
+        return row
+
+def getMazeOracle(walls):
+    """
+    Get a `LazyDistanceTable` for the given walls.
+    The same table is returned for every call with equal walls,
+    so the distances from a cell are only computed the first time they are needed.
+    This is what backs `pacai.core.distance.maze`.
+    """
+
+    oracle = _mazeOracles.get(walls)
+    if (oracle is not None):
+        _mazeOracles.move_to_end(walls)
+        return oracle
+
+    oracle = LazyDistanceTable(LayoutGraph(walls))
+
+    _mazeOracles[walls.freeze()] = oracle
+    if (len(_mazeOracles) > MAX_MAZE_ORACLES):
+        _mazeOracles.popitem(last = False)
+
+    return oracle
+
+def chooseMode(layout):
+    """
+    Pick the distancer mode for a layout:
+    MODE_LAZY if the layout has more than MAX_FULL_TABLE_CELLS open cells, MODE_FULL otherwise.
+    """
+
+    if (layout.getGraph().getNumCells() > MAX_FULL_TABLE_CELLS):
+        return MODE_LAZY
+
+    return MODE_FULL
 
 def computeDistances(layout):
     """
-    Runs UCS to all other positions from each position.
+    Runs BFS to all other positions from each position
+    and returns the results as a `DistanceTable`.
+    """
+
+    graph = layout.getGraph()
+    numCells = graph.getNumCells()
+
+    # Distances can't be longer than the number of cells, so a short is usually enough.
+    typecode = 'h'
+    if (numCells >= 2 ** 15):
+        typecode = 'i'
+
+    adjacency = graph.getAdjacency()
+
+    distances = array.array(typecode)
+    for source in range(numCells):
+        distances.extend(_bfs(adjacency, source, typecode))
+
+    return DistanceTable(graph, distances)
+
+def _bfs(adjacency, source, typecode):
+    """
+    Get an array of the distance from the source cell to every cell.
     """
 
-    distances = {}
-    allNodes = layout.walls.asList(False)
+    row = array.array(typecode, [UNREACHABLE]) * len(adjacency)
+    row[source] = 0
+
+    frontier = [source]
+    distance = 0
 
-    for source in allNodes:
-        dist = {}
-        closed = {}
+    while (len(frontier) > 0):
+        distance += 1
+        nextFrontier = []
 
-        for node in allNodes:
-            dist[node] = sys.maxsize
+        for cellId in frontier:
+            for neighbor in adjacency[cellId]:
+                if (row[neighbor] == UNREACHABLE):
+                    row[neighbor] = distance
+                    nextFrontier.append(neighbor)
 
-        queue = priorityQueue.PriorityQueue()
-        queue.push(source, 0)
-        dist[source] = 0
+        frontier = nextFrontier
 
-        while not queue.isEmpty():
-            node = queue.pop()
-            if node in closed:
-                continue
+    return row
+
+def _bfsToTargets(adjacency, source, targets, stopAtFirst = False):
+    """
+    Run a BFS from the source cell until all of the target cells are reached
+    (or just until the first ones are reached if stopAtFirst is set).
+    Returns a dict of the distances to the cells that were reached.
+    """
 
-            closed[node] = True
-            nodeDist = dist[node]
-            adjacent = []
-            x, y = node
+    distances = {source: 0}
 
-            if not layout.isWall((x, y + 1)):
-                adjacent.append((x, y + 1))
+    remaining = set(targets)
+    numTargets = len(remaining)
+    remaining.discard(source)
 
-            if not layout.isWall((x, y - 1)):
-                adjacent.append((x, y - 1))
+    if (stopAtFirst and len(remaining) < numTargets):
+        return distances
 
-            if not layout.isWall((x + 1, y)):
-                adjacent.append((x + 1, y))
+    frontier = [source]
+    distance = 0
 
-            if not layout.isWall((x - 1, y)):
-                adjacent.append((x - 1, y))
+    while (len(frontier) > 0 and len(remaining) > 0):
+        distance += 1
+        nextFrontier = []
 
-            for other in adjacent:
-                if other not in dist:
-                    continue
+        for cellId in frontier:
+            for neighbor in adjacency[cellId]:
+                if (neighbor not in distances):
+                    distances[neighbor] = distance
+                    nextFrontier.append(neighbor)
+                    remaining.discard(neighbor)
 
-                oldDist = dist[other]
-                newDist = nodeDist + 1
-                if newDist < oldDist:
-                    dist[other] = newDist
-                    queue.push(other, newDist)
+        if (stopAtFirst and len(remaining) < numTargets):
+            break
 
-        for target in allNodes:
-            distances[(target, source)] = dist[target]
+        frontier = nextFrontier
 
     return distances
 
+def _lookupDistances(row, targetIds):
+    """
+    Pick the distances to the targets out of a row (an array or dict indexed by cell id).
+    """
+
+    if (isinstance(row, dict)):
+        distances = [row.get(targetId, UNREACHABLE) for targetId in targetIds]
+    else:
+        distances = list(map(row.__getitem__, targetIds))
+
+    if (UNREACHABLE in distances):
+        distances = [sys.maxsize if (distance == UNREACHABLE) else distance
+                for distance in distances]
+
+    return distances
+
+def setCacheDir(path):
+    """
+    Save computed distance tables in the given directory,
+    and load them from there instead of recomputing them.
+    Tables are keyed by the walls of their layout, see wallsDigest().
+    Pass None to turn off the disk cache.
+    """
+
+    global _cacheDir
+    _cacheDir = path
+
+def getCacheDir():
+    return _cacheDir
+
+def wallsDigest(walls):
+    """
+    Get a stable digest of a wall grid, which is used to name cached distance tables.
+    """
+
+    text = '%d %d\n%s' % (walls.getWidth(), walls.getHeight(), str(walls))
+    return hashlib.sha256(text.encode('ascii')).hexdigest()
+
+def loadDistances(layout, cacheDir):
+    """
+    Load the distance table for a layout from the cache directory.
+    The distances are memory-mapped rather than read into memory.
+    Returns None if there is no usable table in the cache.
+    """
+
+    path = _cachePath(layout, cacheDir)
+    if (not os.path.isfile(path)):
+        return None
+
+    graph = layout.getGraph()
+    numCells = graph.getNumCells()
+
+    with open(path, 'rb') as file:
+        try:
+            data = mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ)
+        except ValueError:
+            # Empty file.
+            return None
+
+    if (len(data) < CACHE_HEADER.size):
+        return None
+
+    magic, version, byteOrder, typecode, fileCells = CACHE_HEADER.unpack_from(data)
+    typecode = typecode.decode('ascii')
+
+    if (magic != CACHE_MAGIC or version != CACHE_VERSION or fileCells != numCells
+            or byteOrder != sys.byteorder[0].encode('ascii') or typecode not in ('h', 'i')):
+        logging.warning("Ignoring unusable distance cache file: '%s'." % (path))
+        return None
+
+    itemSize = array.array(typecode).itemsize
+    if (len(data) != CACHE_HEADER.size + numCells * numCells * itemSize):
+        logging.warning("Ignoring truncated distance cache file: '%s'." % (path))
+        return None
+
+    distances = memoryview(data)[CACHE_HEADER.size:].cast(typecode)
+    return DistanceTable(graph, distances)
+
+def saveDistances(layout, table, cacheDir):
+    """
+    Save a distance table to the cache directory.
+    The file is written to a temporary name first,
+    so other processes never see a partially written table.
+    """
+
+    distances = table._distances
+    header = CACHE_HEADER.pack(CACHE_MAGIC, CACHE_VERSION, sys.byteorder[0].encode('ascii'),
+            distances.typecode.encode('ascii'), table.getGraph().getNumCells())
+
+    os.makedirs(cacheDir, exist_ok = True)
+
+    handle, tempPath = tempfile.mkstemp(dir = cacheDir, suffix = '.tmp')
+    try:
+        with os.fdopen(handle, 'wb') as file:
+            file.write(header)
+            distances.tofile(file)
+
+        os.replace(tempPath, _cachePath(layout, cacheDir))
+    except BaseException:
+        os.remove(tempPath)
+        raise
+
+def _cachePath(layout, cacheDir):
+    return os.path.join(cacheDir, wallsDigest(layout.walls) + CACHE_EXTENSION)
+
+def _getDistanceTable(layout):
+    """
+    Get the distance table for a layout from the disk cache (if enabled),
+    or compute it (and save it to the cache).
+    """
+
+    table = _loadCachedDistances(layout)
+    if (table is not None):
+        return table
+
+    table = computeDistances(layout)
+    _saveCachedDistances(layout, table)
+
+    return table
+
+def _loadCachedDistances(layout):
+    """
+    Get the distance table for a layout from the disk cache,
+    or None if the cache is disabled or does not have the table.
+    """
+
+    cacheDir = _cacheDir
+    if (cacheDir is None):
+        return None
+
+    try:
+        return loadDistances(layout, cacheDir)
+    except OSError as ex:
+        logging.warning("Could not read the distance cache in '%s': %s." % (cacheDir, ex))
+        return None
+
+def _saveCachedDistances(layout, table):
+    cacheDir = _cacheDir
+    if (cacheDir is None):
+        return
+
+    try:
+        saveDistances(layout, table, cacheDir)
+    except OSError as ex:
+        logging.warning("Could not write the distance cache in '%s': %s." % (cacheDir, ex))
+
 def getDistanceOnGrid(distances, pos1, pos2):
-    key = (pos1, pos2)
-    if key in distances:
-        return distances[key]
+    distance = distances.getDistance(pos1, pos2)
+    if (distance is None):
+        return DEFAULT_DISTANCE
 
-    return DEFAULT_DISTANCE
+    return distance
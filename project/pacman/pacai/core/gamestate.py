@@ -1,5 +1,7 @@
 import abc
+import bisect
 import copy
+import operator
 
 from pacai.core.agentstate import AgentState
 from pacai.core.directions import Directions
@@ -15,6 +17,25 @@ class AbstractGameState(abc.ABC):
     Only use the accessor methods to get data about the game state.
     """
 
+    # When set, actions are always checked for legality,
+    # even when the caller asks to skip the check (see setForceValidation()).
+    _forceValidation = False
+
+    # The fields that any move may replace,
+    # saved by applyMove() so that undoMove() can restore them.
+    _MOVE_FIELDS = ('_lastAgentMoved', '_gameover', '_win', '_hash', '_score',
+            '_capsulesCopied', '_ownedAgentStates')
+
+    # The fields that only change when something is eaten,
+    # saved by applyMove() only for the moves that eat (see _saveBoard()).
+    _BOARD_FIELDS = ('_food', '_lastFoodEaten', '_numFood', '_foodPositions', '_boardHash',
+            '_capsules', '_lastCapsuleEaten')
+
+    # Get a tuple of the values of each kind of field.
+    # Children that extend the fields must also replace these.
+    _getMoveFields = operator.attrgetter(*_MOVE_FIELDS)
+    _getBoardFields = operator.attrgetter(*_BOARD_FIELDS)
+
     def __init__(self, layout):
         self._lastAgentMoved = None
         self._gameover = False
@@ -22,17 +43,24 @@ class AbstractGameState(abc.ABC):
 
         self._layout = layout
 
-        # Keep a copy of the hash, since it is expensive to compute.
+        # Keep a copy of the hash.
         # Any children should be sure to clear the hash when modifications are made.
         self._hash = None
 
         # For food and capsules, we will only copy on write (if we eat one of them).
         # This avoid additional copies on successors that don't eat.
+        # The food grid is frozen, so eating always replaces it and it can be handed out as-is.
 
-        self._foodCopied = False
-        self._food = layout.food.copy()
+        self._food = layout.food.freeze()
         self._lastFoodEaten = None
 
+        # Keep a running count of the food so it does not need to be recounted after every move.
+        self._numFood = self._food.count()
+
+        # A sorted tuple of the remaining food positions (in the same order as Grid.asList()).
+        # Being immutable, it is shared between states until one of them eats.
+        self._foodPositions = tuple(self._food.asList())
+
         self._capsulesCopied = False
         self._capsules = layout.capsules.copy()
         self._lastCapsuleEaten = None
@@ -45,13 +73,29 @@ class AbstractGameState(abc.ABC):
         for (isPacman, position) in layout.agentPositions:
             self._agentStates.append(AgentState(position, Directions.STOP, isPacman))
 
+        # Agent states are shared with successors and only copied when they are modified.
+        # This bitmask has the bit (1 << agentIndex) set for each agent state this state owns.
+        self._ownedAgentStates = (1 << len(self._agentStates)) - 1
+
+        # The undo record of the move that is being applied in place (see applyMove()).
+        self._moveRecord = None
+
         self._score = 0
 
+        # A Zobrist hash of the food and capsules on the board.
+        # Eating updates it in place, so it never has to be rebuilt from the whole board.
+        self._zobristTable = layout.getZobristTable()
+        self._boardHash = self._zobristTable.hashBoard(self._food, self._capsules)
+
     @abc.abstractmethod
-    def generateSuccessor(self, agentIndex, action):
+    def generateSuccessor(self, agentIndex, action, validate = True):
         """
         Returns the successor state after the specified agent takes the action.
         Treat the returned state as a SHALLOW copy that has been modified.
+
+        Trusted code that just got the action from getLegalActions() on this same state
+        can pass `validate = False` to skip checking that the action is legal.
+        Passing an illegal action without validation will produce a nonsense state.
         """
 
         pass
@@ -64,6 +108,58 @@ class AbstractGameState(abc.ABC):
 
         pass
 
+    def applyMove(self, agentIndex, action, validate = True):
+        """
+        Apply an action to this state in place (instead of creating a successor).
+        Returns an undo record that can be passed to `AbstractGameState.undoMove`
+        to put this state back exactly how it was.
+
+        This lets tree searches walk down and back up a single state without
+        allocating a new state for every node.
+        Moves must be undone in the reverse order that they were applied.
+
+        See `AbstractGameState.generateSuccessor` for the meaning of validate.
+        """
+
+        if (self.isOver()):
+            raise RuntimeError("Can't apply a move to a terminal state.")
+
+        # The record is a flat list of: the move fields,
+        # the board fields (None if nothing is eaten),
+        # and then the index and original of each agent state that the move replaces.
+        # Nothing the saved fields reference is modified during the move:
+        # food grids are frozen, capsules are copied on write,
+        # and agent states are replaced by copies (see getMutableAgentState()).
+        record = [self._getMoveFields(self), None]
+
+        self._capsulesCopied = False
+        self._ownedAgentStates = 0
+        self._moveRecord = record
+
+        try:
+            self._applySuccessorAction(agentIndex, action, validate)
+        except Exception:
+            self._moveRecord = None
+            self.undoMove(record)
+            raise
+
+        self._moveRecord = None
+
+        return record
+
+    def undoMove(self, record):
+        """
+        Undo a move made with `AbstractGameState.applyMove`.
+        """
+
+        for i in range(2, len(record), 2):
+            self._agentStates[record[i]] = record[i + 1]
+
+        if (record[1] is not None):
+            self.__dict__.update(zip(self._BOARD_FIELDS, record[1]))
+
+        self.__dict__.update(zip(self._MOVE_FIELDS, record[0]))
+
     def addScore(self, score):
         self._hash = None
         self._score += score
@@ -76,12 +172,15 @@ class AbstractGameState(abc.ABC):
         if (not self.hasCapsule(x, y)):
             return False
 
+        self._saveBoard()
+
         if (not self._capsulesCopied):
             self._capsules = self._capsules.copy()
             self._capsulesCopied = True
 
         self._capsules.remove((x, y))
         self._lastCapsuleEaten = (x, y)
+        self._boardHash ^= self._zobristTable.capsuleKey(x, y)
 
         self._hash = None
         return True
@@ -94,12 +193,13 @@ class AbstractGameState(abc.ABC):
         if (not self.hasFood(x, y)):
             return False
 
-        if (not self._foodCopied):
-            self._food = self._food.copy()
-            self._foodCopied = True
+        self._saveBoard()
 
-        self._food[x][y] = False
+        self._food = self._food.updated(x, y, False)
         self._lastFoodEaten = (x, y)
+        self._numFood -= 1
+        self._boardHash ^= self._zobristTable.foodKey(x, y)
+        self._foodPositions = self._removePosition(self._foodPositions, (x, y))
 
         self._hash = None
         return True
@@ -125,6 +225,11 @@ class AbstractGameState(abc.ABC):
         return tuple(int(pos) for pos in position)
 
     def getAgentState(self, index):
+        """
+        Get the `pacai.core.agentstate.AgentState` for an agent.
+        The agent state may be shared with other game states, so do not modify it.
+        """
+
         return self._agentStates[index]
 
     def getAgentStates(self):
@@ -139,16 +244,33 @@ class AbstractGameState(abc.ABC):
 
     def getFood(self):
         """
-        Returns a Grid of boolean food indicator variables.
+        Returns a read-only `pacai.core.grid.FrozenGrid` of boolean food indicator variables.
 
         Grids can be accessed via list notation.
         So to check if there is food at (x, y), just do something like: food[x][y].
 
-        Callers should favor hasFood() over this, since this will make a copy of the grid.
+        The grid is shared with this state and costs nothing to get,
+        but it cannot be modified.
+        Use getFoodCopy() if you need a grid that you can modify.
+        """
+
+        return self._food
+
+    def getFoodCopy(self):
+        """
+        Returns a modifiable copy of the food grid.
         """
 
         return self._food.copy()
 
+    def getFoodPositions(self):
+        """
+        Returns a sorted tuple of the positions (x, y) of the remaining food.
+        This is the same as `getFood().asList()`, but costs nothing to call.
+        """
+
+        return self._foodPositions
+
     def getHighlightLocations(self):
         return self._highlightLocations
 
@@ -173,6 +295,25 @@ class AbstractGameState(abc.ABC):
     def getLastFoodEaten(self):
         return self._lastFoodEaten
 
+    def getMutableAgentState(self, index):
+        """
+        Get the `pacai.core.agentstate.AgentState` for an agent so that it can be modified.
+
+        Agent states are shared between a state and its successors until one of them changes it,
+        so game rules must get an agent state through here before modifying it.
+        """
+
+        if (not ((self._ownedAgentStates >> index) & 1)):
+            if (self._moveRecord is not None):
+                self._moveRecord.append(index)
+                self._moveRecord.append(self._agentStates[index])
+
+            self._agentStates[index] = self._agentStates[index].copy()
+            self._ownedAgentStates |= (1 << index)
+
+        self._hash = None
+        return self._agentStates[index]
+
     def getNumAgents(self):
         return len(self._agentStates)
 
@@ -188,7 +329,7 @@ class AbstractGameState(abc.ABC):
         Get the amount of food left on the board.
         """
 
-        return self._food.count()
+        return self._numFood
 
     def getScore(self):
         return self._score
@@ -238,10 +379,51 @@ class AbstractGameState(abc.ABC):
     def setHighlightLocations(self, locations):
         self._highlightLocations = list(locations)
 
+    @staticmethod
+    def setForceValidation(force):
+        """
+        Force (or stop forcing) every action to be checked for legality,
+        even when trusted code asks to skip the check.
+        This is useful when debugging agents that skip validation.
+        """
+
+        AbstractGameState._forceValidation = force
+
     def setScore(self, score):
         self._score = score
         self._hash = None
 
+    @abc.abstractmethod
+    def _applySuccessorAction(self, agentIndex, action, validate = True):
+        """
+        Apply the action to the context state (self).
+        """
+
+        pass
+
+    def _saveBoard(self):
+        """
+        Save the board fields in the record of the move being applied in place (if there is one),
+        before the move changes them.
+        """
+
+        record = self._moveRecord
+        if (record is not None and record[1] is None):
+            record[1] = self._getBoardFields(self)
+
+    @staticmethod
+    def _shouldValidate(validate):
+        return (validate or AbstractGameState._forceValidation)
+
+    @staticmethod
+    def _removePosition(positions, position):
+        """
+        Get a copy of a sorted tuple of positions without the given position.
+        """
+
+        index = bisect.bisect_left(positions, position)
+        return positions[:index] + positions[(index + 1):]
+
     def _initSuccessor(self):
         """
         Get a state that will eventually serve as a successor.
@@ -252,12 +434,13 @@ class AbstractGameState(abc.ABC):
         successor = copy.copy(self)
         successor._hash = None
 
-        # Leave food and capsules as a shallow copy, but mark them to be copied on write.
-        successor._foodCopied = False
+        # Leave food and capsules as a shallow copy, but mark capsules to be copied on write.
+        # (The food grid is frozen, so it is always replaced rather than modified.)
         successor._capsulesCopied = False
 
-        # Agent states need to be deep copied.
-        successor._agentStates = [agentState.copy() for agentState in self._agentStates]
+        # Agent states are shared until they are modified (see getMutableAgentState()).
+        successor._agentStates = self._agentStates.copy()
+        successor._ownedAgentStates = 0
 
         return successor
 
@@ -288,8 +471,10 @@ class AbstractGameState(abc.ABC):
                 and self._layout == other._layout)
 
     def __hash__(self):
+        # The board is already hashed and agent states cache their own hash,
+        # so this does not depend on the size of the board.
         if (self._hash is None):
-            self._hash = util.buildHash(self._score, self._gameover, self._win, *self._capsules,
-                self._food, *self._agentStates, self._layout)
+            self._hash = util.buildHash(self._score, self._gameover, self._win, self._boardHash,
+                *self._agentStates, self._layout)
 
         return self._hash
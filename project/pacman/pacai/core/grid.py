@@ -1,8 +1,12 @@
 class Grid:
     """
-    A 2-dimensional array of objects backed by a list of lists.
+    A 2-dimensional array of booleans backed by a single bit-packed integer.
     Data is accessed via grid[x][y] where (x, y) are positions on a Pacman map with x horizontal,
     y vertical and the origin (0, 0) in the bottom left corner.
+
+    The cell (x, y) is stored in bit (x * height + y).
+    Since Python integers are immutable, copying, counting, comparing, and hashing a grid
+    only cost one pass over the machine words of that integer.
     """
 
     def __init__(self, width, height, initialValue = False):
@@ -11,11 +15,30 @@ class Grid:
 
         self._width = width
         self._height = height
-        self._data = [[initialValue for y in range(height)] for x in range(width)]
+
+        # The bits live in a one element list so that column views can share it
+        # without holding a reference back to the grid.
+        bits = 0
+        if (initialValue):
+            bits = (1 << (width * height)) - 1
+        self._store = [bits]
+
+        # Column views are created lazily and reused for the life of this grid.
+        self._columns = None
 
     def asList(self, key = True):
         values = []
 
+        if (key):
+            # Walk only the set bits, they are already in (x, y) order.
+            bits = self._store[0]
+            while (bits):
+                lowBit = bits & -bits
+                values.append(self._cellIndexToPosition(lowBit.bit_length() - 1))
+                bits ^= lowBit
+
+            return values
+
         for x in range(self._width):
             for y in range(self._height):
                 if self[x][y] == key:
@@ -25,15 +48,30 @@ class Grid:
 
     def copy(self):
         grid = Grid(self._width, self._height)
-        grid._data = [row.copy() for row in self._data]
+        grid._store[0] = self._store[0]
         return grid
 
-    def count(self, item =True):
-        return sum([x.count(item) for x in self._data])
+    def count(self, item = True):
+        numSet = bin(self._store[0]).count('1')
+
+        if (item):
+            return numSet
+
+        return self._width * self._height - numSet
 
     def deepCopy(self):
         return self.copy()
 
+    def freeze(self):
+        """
+        Get a read-only snapshot of this grid.
+        The snapshot shares this grid's bits, so no cells are copied.
+        """
+
+        grid = FrozenGrid(self._width, self._height)
+        grid._store[0] = self._store[0]
+        return grid
+
     def getHeight(self):
         return self._height
 
@@ -41,44 +79,188 @@ class Grid:
         return self._width
 
     def shallowCopy(self):
-        grid = Grid(self._width, self._height)
-        grid._data = self._data
+        return self.copy()
+
+    def updated(self, x, y, value):
+        """
+        Get a copy of this grid (of the same type) with the cell (x, y) set to value.
+        This grid is not modified, so this also works on frozen grids.
+        """
+
+        mask = 1 << (self._checkColumn(x) * self._height + self._checkRow(y))
+
+        grid = self.__class__(self._width, self._height)
+        if (value):
+            grid._store[0] = self._store[0] | mask
+        else:
+            grid._store[0] = self._store[0] & ~mask
+
         return grid
 
     def _cellIndexToPosition(self, index):
-        x = index / self._height
+        x = index // self._height
         y = index % self._height
 
         return x, y
 
+    def _checkColumn(self, x):
+        if (x < 0):
+            x += self._width
+
+        if (x < 0 or x >= self._width):
+            raise IndexError('Grid column out of range: %d.' % (x))
+
+        return x
+
+    def _checkRow(self, y):
+        if (y < 0):
+            y += self._height
+
+        if (y < 0 or y >= self._height):
+            raise IndexError('Grid row out of range: %d.' % (y))
+
+        return y
+
+    def _newColumn(self, x):
+        return _GridColumn(self._store, x * self._height, self._height)
+
     def __eq__(self, other):
-        if (other is None):
+        if (other is None or not isinstance(other, Grid)):
             return False
 
-        return self._data == other._data
+        return (self._store[0] == other._store[0]
+                and self._width == other._width
+                and self._height == other._height)
 
     def __getitem__(self, i):
-        return self._data[i]
+        columns = self._columns
+        if (columns is None):
+            columns = [None] * self._width
+            self._columns = columns
 
-    def __hash__(self):
-        hashcode = 0
-        base = 1
+        column = columns[i]
+        if (column is None):
+            column = self._newColumn(self._checkColumn(i))
+            columns[i] = column
+
+        return column
 
-        for row in self._data:
-            for value in row:
-                if (value):
-                    hashcode += base
-                base *= 2
+    def __getstate__(self):
+        # Column views are just a cache.
+        state = self.__dict__.copy()
+        state['_columns'] = None
+        return state
 
-        return hash(hashcode)
+    def __hash__(self):
+        return hash(self._store[0])
 
     def __lt__(self, other):
         return self.__hash__() < other.__hash__()
 
     def __setitem__(self, key, item):
-        self._data[key] = item
+        column = self[key]
+
+        values = list(item)
+        if (len(values) != self._height):
+            raise ValueError('Grid columns must have exactly %d values.' % (self._height))
+
+        for y in range(self._height):
+            column[y] = values[y]
 
     def __str__(self):
-        out = [[str(self._data[x][y])[0] for x in range(self._width)] for y in range(self._height)]
+        out = [[str(self[x][y])[0] for x in range(self._width)] for y in range(self._height)]
         out.reverse()
         return '\n'.join([''.join(x) for x in out])
+
+class _GridColumn:
+    """
+    A lightweight view of a single column of a `Grid`.
+    Reads and writes go directly to the grid's bits.
+    """
+
+    __slots__ = ('_store', '_offset', '_height')
+
+    def __init__(self, store, offset, height):
+        self._store = store
+        self._offset = offset
+        self._height = height
+
+    def count(self, item):
+        return sum(1 for value in self if value == item)
+
+    def copy(self):
+        return list(self)
+
+    def _checkRow(self, y):
+        if (y < 0):
+            y += self._height
+
+        if (y < 0 or y >= self._height):
+            raise IndexError('Grid row out of range: %d.' % (y))
+
+        return y
+
+    def __eq__(self, other):
+        if (isinstance(other, _GridColumn)):
+            other = list(other)
+
+        return list(self) == other
+
+    def __getitem__(self, y):
+        try:
+            if (0 <= y < self._height):
+                return ((self._store[0] >> (self._offset + y)) & 1) == 1
+        except TypeError:
+            if (isinstance(y, slice)):
+                return list(self)[y]
+
+            raise
+
+        return ((self._store[0] >> (self._offset + self._checkRow(y))) & 1) == 1
+
+    def __iter__(self):
+        bits = self._store[0] >> self._offset
+        for y in range(self._height):
+            yield ((bits >> y) & 1) == 1
+
+    def __len__(self):
+        return self._height
+
+    def __setitem__(self, y, value):
+        mask = 1 << (self._offset + self._checkRow(y))
+
+        if (value):
+            self._store[0] |= mask
+        else:
+            self._store[0] &= ~mask
+
+    def __str__(self):
+        return str(list(self))
+
+class _FrozenGridColumn(_GridColumn):
+    """
+    A read-only view of a single column of a `FrozenGrid`.
+    """
+
+    __slots__ = ()
+
+    def __setitem__(self, y, value):
+        raise TypeError('Frozen grids cannot be modified, use copy() to get a modifiable grid.')
+
+class FrozenGrid(Grid):
+    """
+    A read-only `Grid`.
+    Any attempt to modify it raises a TypeError.
+    `Grid.copy` still returns a normal (modifiable) grid.
+
+    Since frozen grids never change, they can be freely shared instead of copied.
+    """
+
+    def freeze(self):
+        return self
+
+    def _newColumn(self, x):
+        return _FrozenGridColumn(self._store, x * self._height, self._height)
+
+    def __setitem__(self, key, item):
+        raise TypeError('Frozen grids cannot be modified, use copy() to get a modifiable grid.')
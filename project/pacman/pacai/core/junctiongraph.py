@@ -0,0 +1,123 @@
+"""
+A contracted view of a `pacai.core.layoutgraph.LayoutGraph`.
+
+Most open cells of a maze are in corridors: they have exactly two neighbors,
+so a search that enters a corridor can only walk to its other end.
+A junction graph only keeps the junctions (cells with one, three, or four neighbors)
+and replaces each corridor between two junctions with a single edge,
+which remembers the cells and actions along the corridor.
+
+An edge is a tuple (target cell id, cell ids, actions),
+where the cell ids are every cell entered along the edge (ending with the target)
+and the actions are the directions that enter them.
+"""
+
+from pacai.core.actions import Actions
+
+class JunctionGraph(object):
+    """
+    The junctions of a layout and the corridors between them.
+    Graphs are built once per `pacai.core.layout.Layout`,
+    see `pacai.core.layout.Layout.getJunctionGraph`.
+    """
+
+    def __init__(self, graph):
+        self._graph = graph
+
+        numCells = graph.getNumCells()
+        self._isJunction = [graph.getDegree(cellId) != 2 for cellId in range(numCells)]
+
+        # The edges leaving each junction, by cell id.
+        self._edges = {}
+
+        reached = [False] * numCells
+
+        for cellId in range(numCells):
+            if (self._isJunction[cellId]):
+                self._addJunction(cellId, reached)
+
+        # Loops that are all corridor (no junctions) get one of their cells as a junction.
+        for cellId in range(numCells):
+            if (not reached[cellId]):
+                self._isJunction[cellId] = True
+                self._addJunction(cellId, reached)
+
+    def getEdges(self, cellId):
+        """
+        Get a tuple of the edges leaving a cell.
+        For a junction, these are the corridors to its neighboring junctions.
+        For a cell in a corridor, these are the two ways along the corridor
+        to the junctions at its ends.
+        """
+
+        edges = self._edges.get(cellId)
+        if (edges is not None):
+            return edges
+
+        return tuple(self._walk(cellId, nextId, action)
+                for nextId, action in self._graph.getSuccessorIds(cellId))
+
+    def getGraph(self):
+        return self._graph
+
+    def getJunctions(self):
+        """
+        Get a list of the cell ids of all the junctions.
+        """
+
+        return sorted(self._edges.keys())
+
+    def getNumJunctions(self):
+        return len(self._edges)
+
+    def isJunction(self, cellId):
+        return self._isJunction[cellId]
+
+    def reverseEdge(self, source, edge):
+        """
+        Get the edge that walks an edge leaving source the other way, back to source.
+        """
+
+        target, cells, actions = edge
+
+        reverseCells = cells[-2::-1] + (source,)
+        reverseActions = tuple(Actions.reverseDirection(action) for action in reversed(actions))
+
+        return (source, reverseCells, reverseActions)
+
+    def _addJunction(self, cellId, reached):
+        reached[cellId] = True
+
+        edges = []
+        for nextId, action in self._graph.getSuccessorIds(cellId):
+            edge = self._walk(cellId, nextId, action)
+            edges.append(edge)
+
+            for corridorId in edge[1]:
+                reached[corridorId] = True
+
+        self._edges[cellId] = tuple(edges)
+
+    def _walk(self, source, nextId, action):
+        """
+        Walk from source to its neighbor nextId, and then along the corridor until a junction.
+        """
+
+        cells = [nextId]
+        actions = [action]
+
+        previous = source
+        current = nextId
+
+        while (not self._isJunction[current]):
+            for candidate, candidateAction in self._graph.getSuccessorIds(current):
+                if (candidate != previous):
+                    break
+
+            previous = current
+            current = candidate
+
+            cells.append(current)
+            actions.append(candidateAction)
+
+        return (current, tuple(cells), tuple(actions))
@@ -1,8 +1,13 @@
 import os
 import random
 
+from pacai.core.actions import Actions
+from pacai.core.directions import Directions
 from pacai.core.distance import manhattan
 from pacai.core.grid import Grid
+from pacai.core.junctiongraph import JunctionGraph
+from pacai.core.layoutgraph import LayoutGraph
+from pacai.core.zobrist import ZobristTable
 
 # By default, the layout directory is adjacent to this file.
 DEFAULT_LAYOUT_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'layouts')
@@ -24,6 +29,17 @@ class Layout(object):
         self.numGhosts = 0
         self.layoutText = layoutText
 
+        # Built on demand, see getZobristTable().
+        self._zobristTable = None
+
+        # Built on demand, see getGraph() and getJunctionGraph().
+        self._graph = None
+        self._junctionGraph = None
+
+        # Built on demand, see getPossibleActions() and getPossibleGhostActions().
+        self._possibleActions = None
+        self._possibleGhostActions = None
+
         self.processLayoutText(layoutText, maxGhosts)
 
     def getNumGhosts(self):
@@ -33,9 +49,68 @@ class Layout(object):
         x, col = pos
         return self.walls[x][col]
 
+    def getGraph(self):
+        """
+        Get the `pacai.core.layoutgraph.LayoutGraph` of the open cells in this layout.
+        """
+
+        if (self._graph is None):
+            self._graph = LayoutGraph(self.walls)
+
+        return self._graph
+
+    def getJunctionGraph(self):
+        """
+        Get the `pacai.core.junctiongraph.JunctionGraph` (the graph with its corridors contracted)
+        of the open cells in this layout.
+        """
+
+        if (self._junctionGraph is None):
+            self._junctionGraph = JunctionGraph(self.getGraph())
+
+        return self._junctionGraph
+
     def getHeight(self):
         return self.height
 
+    def getPossibleActions(self, position):
+        """
+        Get a tuple of the actions possible from the open cell at position,
+        the same as `pacai.core.actions.Actions.getPossibleActions` would give.
+        Returns None if the position is not an open cell with integer coordinates.
+        """
+
+        if (self._possibleActions is None):
+            self._buildActionTables()
+
+        return self._possibleActions.get(position)
+
+    def getPossibleGhostActions(self, position, direction):
+        """
+        Get a tuple of the actions possible for a ghost facing direction from the open cell at
+        position, the same as `pacai.core.actions.Actions.getPossibleGhostActions` would give.
+        Returns None if the position is not an open cell with integer coordinates.
+        """
+
+        if (self._possibleGhostActions is None):
+            self._buildActionTables()
+
+        actions = self._possibleGhostActions.get(position)
+        if (actions is None):
+            return None
+
+        return actions[direction]
+
+    def getZobristTable(self):
+        """
+        Get the `pacai.core.zobrist.ZobristTable` shared by all game states on this layout.
+        """
+
+        if (self._zobristTable is None):
+            self._zobristTable = ZobristTable(self)
+
+        return self._zobristTable
+
     def getWidth(self):
         return self.width
 
@@ -72,6 +147,43 @@ class Layout(object):
         row, col = [int(x) for x in pacPos]
         return ghostPos in self.visibility[row][col][pacDirection]
 
+    def _buildActionTables(self):
+        """
+        Compute the possible actions for every open cell.
+        """
+
+        self._possibleActions = {}
+        self._possibleGhostActions = {}
+
+        directions = Directions.CARDINAL + [Directions.STOP]
+
+        for position in self.getGraph().getPositions():
+            x, y = position
+
+            # Cells on the border can't be checked for walls on all sides.
+            if (x == 0 or y == 0 or x == self.width - 1 or y == self.height - 1):
+                continue
+
+            actions = Actions.getPossibleActions(position, Directions.STOP, self.walls)
+            self._possibleActions[position] = tuple(actions)
+
+            ghostActions = {}
+            for direction in directions:
+                actions = Actions.getPossibleGhostActions(position, direction, self.walls)
+                ghostActions[direction] = tuple(actions)
+
+            self._possibleGhostActions[position] = ghostActions
+
+    def __getstate__(self):
+        # Derived tables are rebuilt on demand, don't ship them around with the layout.
+        state = self.__dict__.copy()
+        state['_zobristTable'] = None
+        state['_graph'] = None
+        state['_junctionGraph'] = None
+        state['_possibleActions'] = None
+        state['_possibleGhostActions'] = None
+        return state
+
     def __str__(self):
         return "\n".join(self.layoutText)
 
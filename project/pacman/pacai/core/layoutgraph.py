@@ -0,0 +1,136 @@
+"""
+A compiled view of the open cells of a maze.
+
+Every open (non-wall) cell gets a dense integer id, starting at 0 and assigned in (x, y) order.
+The neighbors of each cell are stored in flat arrays using the compressed sparse row (CSR) layout:
+the neighbors of cell `i` are `neighbors[offsets[i]:offsets[i + 1]]`,
+and `actions[j]` is the direction that moves from cell `i` to `neighbors[j]`.
+Neighbors are always listed in `pacai.core.directions.Directions.CARDINAL` order,
+so code that walks the graph visits successors in the same order as code that checks the walls.
+"""
+
+import array
+
+from pacai.core.actions import Actions
+from pacai.core.directions import Directions
+
+class LayoutGraph(object):
+    """
+    The graph of open cells in a wall grid.
+    Graphs are built once per `pacai.core.layout.Layout`,
+    see `pacai.core.layout.Layout.getGraph`.
+    """
+
+    def __init__(self, walls):
+        self._width = walls.getWidth()
+        self._height = walls.getHeight()
+
+        # Map a grid index (x * height + y) to a cell id (or -1 for walls).
+        self._gridToCell = array.array('i', [-1]) * (self._width * self._height)
+
+        self._positions = walls.asList(False)
+        self._cellIds = {}
+
+        for cellId, (x, y) in enumerate(self._positions):
+            self._gridToCell[x * self._height + y] = cellId
+            self._cellIds[(x, y)] = cellId
+
+        self.offsets = array.array('i', [0])
+        self.neighbors = array.array('i')
+        self.actions = []
+
+        # The (position, action) and (cell id, action) pairs for each cell,
+        # in the same order as the CSR arrays.
+        self._successors = []
+        self._successorIds = []
+
+        # Built on demand, see getAdjacency().
+        self._adjacency = None
+
+        for (x, y) in self._positions:
+            successors = []
+            successorIds = []
+
+            for action in Directions.CARDINAL:
+                dx, dy = Actions.directionToVector(action)
+                neighbor = self._gridToCellId(int(x + dx), int(y + dy))
+                if (neighbor == -1):
+                    continue
+
+                self.neighbors.append(neighbor)
+                self.actions.append(action)
+                successors.append((self._positions[neighbor], action))
+                successorIds.append((neighbor, action))
+
+            self.offsets.append(len(self.neighbors))
+            self._successors.append(tuple(successors))
+            self._successorIds.append(tuple(successorIds))
+
+    def getAdjacency(self):
+        """
+        Get a list (indexed by cell id) of tuples of neighboring cell ids.
+        This is the same information as the CSR arrays,
+        but is faster to walk from Python code.
+        """
+
+        if (self._adjacency is None):
+            self._adjacency = [tuple(self.getNeighbors(cellId))
+                    for cellId in range(len(self._positions))]
+
+        return self._adjacency
+
+    def getCellId(self, position):
+        """
+        Get the id of the open cell at position.
+        Returns None if the position is not an open cell with integer coordinates.
+        """
+
+        return self._cellIds.get(position)
+
+    def getDegree(self, cellId):
+        return self.offsets[cellId + 1] - self.offsets[cellId]
+
+    def getNeighbors(self, cellId):
+        """
+        Get the ids of the cells adjacent to the cell with the given id.
+        """
+
+        return self.neighbors[self.offsets[cellId]:self.offsets[cellId + 1]]
+
+    def getNumCells(self):
+        return len(self._positions)
+
+    def getPosition(self, cellId):
+        return self._positions[cellId]
+
+    def getPositions(self):
+        """
+        Get a list of the positions of all open cells, indexed by cell id.
+        """
+
+        return list(self._positions)
+
+    def getSuccessors(self, position):
+        """
+        Get a tuple of (position, action) pairs for the open cells adjacent to position.
+        Returns None if the position is not an open cell with integer coordinates.
+        """
+
+        cellId = self._cellIds.get(position)
+        if (cellId is None):
+            return None
+
+        return self._successors[cellId]
+
+    def getSuccessorIds(self, cellId):
+        """
+        Get a tuple of (cell id, action) pairs for the cells adjacent to the cell with the given id.
+        """
+
+        return self._successorIds[cellId]
+
+    def _gridToCellId(self, x, y):
+        if (x < 0 or x >= self._width or y < 0 or y >= self._height):
+            return -1
+
+        return self._gridToCell[x * self._height + y]
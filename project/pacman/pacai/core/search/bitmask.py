@@ -0,0 +1,190 @@
+"""
+Compact search states for problems about a fixed set of items on the board
+(like the food in `pacai.core.search.food.FoodSearchProblem`).
+
+A state is the cell id of Pacman's position (see `pacai.core.layoutgraph.LayoutGraph`)
+and an integer bitmask over the items, where bit `i` stands for the `i`th item of a `BitmaskIndex`.
+Since both are plain integers, states are small and hashing or comparing them takes constant time
+(for any reasonable number of items).
+
+States still unpack like the old (position, grid) tuples,
+and the items come back as a `BitmaskSet` which supports `asList()` and `count()`,
+so heuristics written for grids keep working.
+"""
+
+class BitmaskIndex(object):
+    """
+    Assigns a bit to each of a list of positions,
+    and knows which bits belong to each cell of a `pacai.core.layoutgraph.LayoutGraph`.
+    Indexes are built once per search problem and shared by all of its states.
+    """
+
+    def __init__(self, graph, positions):
+        self.graph = graph
+        self._positions = list(positions)
+        self._bits = {position: (1 << i) for i, position in enumerate(self._positions)}
+
+        # The bit for each cell id (0 for cells that are not one of the positions).
+        self._cellBits = [0] * graph.getNumCells()
+
+        # The cell id for each bit (None for positions that are not open cells).
+        self._bitCellIds = []
+
+        for i, position in enumerate(self._positions):
+            cellId = graph.getCellId(position)
+            self._bitCellIds.append(cellId)
+
+            if (cellId is not None):
+                self._cellBits[cellId] |= (1 << i)
+
+    def getBit(self, position):
+        """
+        Get the bit for a position (0 if the position is not in this index).
+        """
+
+        return self._bits.get(position, 0)
+
+    def getCellBit(self, cellId):
+        return self._cellBits[cellId]
+
+    def getFullMask(self):
+        return (1 << len(self._positions)) - 1
+
+    def getNumItems(self):
+        return len(self._positions)
+
+    def getPositions(self):
+        return list(self._positions)
+
+    def toList(self, mask):
+        """
+        Get the positions whose bits are set in mask, in index order.
+        """
+
+        positions = []
+
+        while (mask):
+            lowBit = mask & -mask
+            positions.append(self._positions[lowBit.bit_length() - 1])
+            mask ^= lowBit
+
+        return positions
+
+    def toCellIds(self, mask):
+        """
+        Get the cell ids of the (open) positions whose bits are set in mask, in index order.
+        """
+
+        cellIds = []
+
+        while (mask):
+            lowBit = mask & -mask
+            cellId = self._bitCellIds[lowBit.bit_length() - 1]
+            if (cellId is not None):
+                cellIds.append(cellId)
+
+            mask ^= lowBit
+
+        return cellIds
+
+    def toMask(self, positions):
+        mask = 0
+
+        for position in positions:
+            mask |= self.getBit(position)
+
+        return mask
+
+class BitmaskSet(object):
+    """
+    A read-only view of the positions in a bitmask.
+    This has the parts of the `pacai.core.grid.Grid` interface that heuristics usually need.
+    """
+
+    __slots__ = ('mask', '_index')
+
+    def __init__(self, mask, index):
+        self.mask = mask
+        self._index = index
+
+    def asList(self):
+        return self._index.toList(self.mask)
+
+    def count(self, item = True):
+        numSet = bin(self.mask).count('1')
+
+        if (item):
+            return numSet
+
+        return self._index.getNumItems() - numSet
+
+    def __contains__(self, position):
+        return (self.mask & self._index.getBit(position)) != 0
+
+    def __eq__(self, other):
+        if (not isinstance(other, BitmaskSet)):
+            return False
+
+        return self.mask == other.mask and self._index is other._index
+
+    def __hash__(self):
+        return hash(self.mask)
+
+    def __iter__(self):
+        return iter(self.asList())
+
+    def __len__(self):
+        return self.count()
+
+    def __str__(self):
+        return str(self.asList())
+
+class BitmaskState(object):
+    """
+    A search state made of Pacman's cell id and a bitmask over the items of a `BitmaskIndex`.
+
+    For compatibility with (position, items) tuples,
+    `state[0]` is Pacman's position, `state[1]` is a `BitmaskSet` of the items,
+    and states can be unpacked the same way.
+    """
+
+    __slots__ = ('cellId', 'mask', '_index')
+
+    def __init__(self, cellId, mask, index):
+        self.cellId = cellId
+        self.mask = mask
+        self._index = index
+
+    def getIndex(self):
+        return self._index
+
+    def getItems(self):
+        return BitmaskSet(self.mask, self._index)
+
+    def getPosition(self):
+        return self._index.graph.getPosition(self.cellId)
+
+    def __eq__(self, other):
+        if (not isinstance(other, BitmaskState)):
+            return False
+
+        return self.cellId == other.cellId and self.mask == other.mask
+
+    def __getitem__(self, i):
+        return (self.getPosition(), self.getItems())[i]
+
+    def __hash__(self):
+        return hash((self.cellId, self.mask))
+
+    def __iter__(self):
+        yield self.getPosition()
+        yield self.getItems()
+
+    def __len__(self):
+        return 2
+
+    def __lt__(self, other):
+        return (self.cellId, self.mask) < (other.cellId, other.mask)
+
+    def __repr__(self):
+        return 'BitmaskState(%s, %s)' % (str(self.getPosition()), str(self.getItems()))
@@ -0,0 +1,718 @@
+"""
+Library implementations of the standard graph search algorithms.
+
+All of the searches here are graph searches over a `pacai.core.search.problem.SearchProblem`
+and return a list of actions that reaches a goal (or None if no goal can be reached).
+Search states must be hashable.
+
+Instead of carrying a copy of the path in every search node,
+the searches remember the parent (and action) of each closed state and rebuild the path at the end.
+Path costs are also kept incrementally (the cost of a node is the cost of its parent plus the
+cost of the step), so `pacai.core.search.problem.SearchProblem.actionsCost` is never called.
+
+`pacai.agents.search.base.SearchAgent` can select these searches by their short names,
+see `SEARCH_FUNCTIONS`.
+
+The searches record what they did in the problem's `pacai.core.search.stats.SearchStats`.
+
+`idastar` and `smastar` are versions of A* that use a bounded amount of memory
+(at most maxNodes stored states) for problems whose states are too big or too many for `astar`.
+"""
+
+import collections
+import heapq
+import itertools
+import time
+
+from pacai.core.search.heuristic import null as nullHeuristic
+
+# The default number of states that the memory-bounded searches may store.
+DEFAULT_MAX_NODES = 100000
+
+def bfs(problem):
+    """
+    Search the shallowest nodes in the search tree first.
+    """
+
+    stats = problem.getStats()
+    start = problem.startingState()
+
+    parents = {start: (None, None)}
+    frontier = collections.deque([start])
+
+    try:
+        while (len(frontier) > 0):
+            state = frontier.popleft()
+            if (problem.isGoal(state)):
+                return _buildPath(parents, state)
+
+            for (successor, action, cost) in _getSuccessors(problem, state, stats):
+                if (successor not in parents):
+                    parents[successor] = (state, action)
+                    frontier.append(successor)
+
+            if (len(frontier) > stats.maxFrontier):
+                stats.maxFrontier = len(frontier)
+
+        return None
+    finally:
+        stats.closedSize = len(parents)
+
+def dfs(problem):
+    """
+    Search the deepest nodes in the search tree first.
+    """
+
+    stats = problem.getStats()
+    start = problem.startingState()
+
+    closed = {}
+    frontier = [(start, None, None)]
+
+    try:
+        while (len(frontier) > 0):
+            state, parent, action = frontier.pop()
+            if (state in closed):
+                continue
+
+            closed[state] = (parent, action)
+            if (problem.isGoal(state)):
+                return _buildPath(closed, state)
+
+            for (successor, successorAction, cost) in _getSuccessors(problem, state, stats):
+                if (successor not in closed):
+                    frontier.append((successor, state, successorAction))
+
+            if (len(frontier) > stats.maxFrontier):
+                stats.maxFrontier = len(frontier)
+
+        return None
+    finally:
+        stats.closedSize = len(closed)
+
+def bidirectional(problem):
+    """
+    Search from the start and back from the goal at the same time (by least total cost),
+    and join the two halves of the path where they meet.
+
+    This only works for problems with a single goal state in `problem.goal`
+    that can also give the predecessors of a state with `problem.predecessorStates(state)`
+    (in the same form as `pacai.core.search.problem.SearchProblem.successorStates`),
+    like `pacai.core.search.position.PositionSearchProblem`.
+    """
+
+    stats = problem.getStats()
+    start = problem.startingState()
+    goal = problem.goal
+
+    if (problem.isGoal(start)):
+        return []
+
+    counter = itertools.count()
+
+    # Forward parents point towards the start, backward parents point towards the goal.
+    costs = ({start: 0}, {goal: 0})
+    parents = ({start: (None, None)}, {goal: (None, None)})
+    closed = (set(), set())
+    frontiers = ([(0, next(counter), start)], [(0, next(counter), goal)])
+    expand = (problem.successorStates, problem.predecessorStates)
+
+    bestCost = float('inf')
+    meeting = None
+
+    try:
+        while (len(frontiers[0]) > 0 and len(frontiers[1]) > 0):
+            # No path through the nodes that are left can be cheaper than the best one found.
+            if (frontiers[0][0][0] + frontiers[1][0][0] >= bestCost):
+                break
+
+            side = 0
+            if (len(frontiers[1]) < len(frontiers[0])):
+                side = 1
+
+            other = 1 - side
+
+            cost, index, state = heapq.heappop(frontiers[side])
+            if (state in closed[side]):
+                continue
+
+            closed[side].add(state)
+
+            startTime = time.perf_counter()
+            neighbors = expand[side](state)
+            stats.successorTime += time.perf_counter() - startTime
+            stats.generated += len(neighbors)
+
+            for (neighbor, action, stepCost) in neighbors:
+                if (neighbor in closed[side]):
+                    continue
+
+                neighborCost = cost + stepCost
+
+                oldCost = costs[side].get(neighbor)
+                if (oldCost is not None and oldCost <= neighborCost):
+                    continue
+
+                costs[side][neighbor] = neighborCost
+                parents[side][neighbor] = (state, action)
+                heapq.heappush(frontiers[side], (neighborCost, next(counter), neighbor))
+
+                otherCost = costs[other].get(neighbor)
+                if (otherCost is not None and neighborCost + otherCost < bestCost):
+                    bestCost = neighborCost + otherCost
+                    meeting = neighbor
+
+            frontierSize = len(frontiers[0]) + len(frontiers[1])
+            if (frontierSize > stats.maxFrontier):
+                stats.maxFrontier = frontierSize
+
+        if (meeting is None):
+            return None
+
+        # The paths met, so the goal was reached (this records it like the other searches).
+        problem.isGoal(goal)
+
+        actions = _buildPath(parents[0], meeting)
+
+        state = meeting
+        nextState, action = parents[1][state]
+        while (nextState is not None):
+            actions.append(action)
+            state = nextState
+            nextState, action = parents[1][state]
+
+        return actions
+    finally:
+        stats.closedSize = len(closed[0]) + len(closed[1])
+
+def ucs(problem):
+    """
+    Search the node of least total cost first.
+    """
+
+    return _bestFirstSearch(problem, lambda state, cost: cost)
+
+def astar(problem, heuristic = nullHeuristic, cacheHeuristic = False):
+    """
+    Search the node that has the lowest combined cost and heuristic first.
+
+    If cacheHeuristic is set, the heuristic is only called once per state.
+    """
+
+    heuristic = _getHeuristic(problem, heuristic, cacheHeuristic)
+    return _bestFirstSearch(problem, lambda state, cost: cost + heuristic(state))
+
+def greedy(problem, heuristic = nullHeuristic, cacheHeuristic = False):
+    """
+    Search the node that has the lowest heuristic first.
+
+    If cacheHeuristic is set, the heuristic is only called once per state.
+    """
+
+    heuristic = _getHeuristic(problem, heuristic, cacheHeuristic)
+    return _bestFirstSearch(problem, lambda state, cost: heuristic(state))
+
+def idastar(problem, heuristic = nullHeuristic, maxNodes = DEFAULT_MAX_NODES):
+    """
+    Iterative deepening A*:
+    repeated depth-first searches that cut off nodes whose cost plus heuristic is over a bound,
+    raising the bound to the smallest cut off value after each search.
+
+    Memory is only used for the current path and a transposition table
+    that remembers the cheapest cost each state was reached with in the current iteration
+    (so the same state is not searched again through a path that is no cheaper).
+    The table stores at most maxNodes states, further states are just not remembered.
+    """
+
+    stats = problem.getStats()
+    heuristic = _getHeuristic(problem, heuristic, False)
+    start = problem.startingState()
+
+    if (problem.isGoal(start)):
+        return []
+
+    bound = heuristic(start)
+    while (True):
+        actions, bound = _boundedDepthFirstSearch(problem, heuristic, start, bound,
+                int(maxNodes), stats)
+
+        if (actions is not None):
+            return actions
+
+        if (bound == float('inf')):
+            return None
+
+def smastar(problem, heuristic = nullHeuristic, maxNodes = DEFAULT_MAX_NODES):
+    """
+    Simplified memory-bounded A*:
+    A* that keeps at most maxNodes search nodes in memory.
+
+    When memory is full, the open leaf with the highest cost plus heuristic
+    (the shallowest one for ties) is forgotten, and its value is backed up into its parent.
+    A node with forgotten children stays open with the best value of those children,
+    and regenerates them (with their backed up values) when it is expanded again.
+    If maxNodes is too small to hold the best path, the limit is exceeded instead of failing.
+    """
+
+    stats = problem.getStats()
+    heuristic = _getHeuristic(problem, heuristic, False)
+    maxNodes = int(maxNodes)
+
+    start = problem.startingState()
+    root = _MemoryNode(start, None, None, 0, heuristic(start), 0)
+
+    frontier = _MemoryFrontier()
+    frontier.push(root, root.value)
+
+    # The cheapest node in memory for each state.
+    memory = {start: root}
+    numNodes = 1
+
+    try:
+        while (len(frontier) > 0):
+            node = frontier.popBest()
+
+            bound = node.priority
+            if (bound == float('inf')):
+                return None
+
+            if (problem.isGoal(node.state)):
+                return _buildNodePath(node)
+
+            # All the forgotten children (that are not dead ends) are about to be regenerated.
+            forgotten = node.forgotten
+            node.forgotten = None
+
+            for (successor, action, stepCost) in _getSuccessors(problem, node.state, stats):
+                successorCost = node.cost + stepCost
+
+                # This also skips the children of this node that are still in memory.
+                other = memory.get(successor)
+                if (other is not None and other.cost <= successorCost):
+                    continue
+
+                # Values never decrease along a path (pathmax),
+                # so backed up values stay consistent with the heuristic.
+                value = max(node.value, successorCost + heuristic(successor))
+                if (forgotten is not None and successor in forgotten):
+                    value = max(value, forgotten[successor])
+
+                if (value == float('inf')):
+                    # Still a dead end, keep remembering it instead of regenerating it.
+                    if (node.forgotten is None):
+                        node.forgotten = {}
+
+                    node.forgotten[successor] = value
+                    continue
+
+                child = _MemoryNode(successor, node, action, successorCost, value, node.depth + 1)
+
+                node.numChildren += 1
+                memory[successor] = child
+                numNodes += 1
+                frontier.push(child, value)
+
+            if (node.numChildren == 0):
+                # A dead end (or a node whose successors are all better reached some other way).
+                node.value = float('inf')
+                if (node.parent is None):
+                    return None
+
+                numNodes -= _forgetNode(node, frontier, memory)
+
+            while (numNodes > maxNodes):
+                leaf = frontier.popWorstLeaf()
+                if (leaf is None):
+                    break
+
+                numNodes -= _forgetNode(leaf, frontier, memory)
+
+            if (numNodes > stats.closedSize):
+                stats.closedSize = numNodes
+
+            if (len(frontier) > stats.maxFrontier):
+                stats.maxFrontier = len(frontier)
+
+        return None
+    finally:
+        stats.closedSize = max(stats.closedSize, numNodes)
+
+# The searches by their short name.
+SEARCH_FUNCTIONS = {
+    'astar': astar,
+    'bfs': bfs,
+    'bidirectional': bidirectional,
+    'dfs': dfs,
+    'greedy': greedy,
+    'idastar': idastar,
+    'smastar': smastar,
+    'ucs': ucs,
+}
+
+def _bestFirstSearch(problem, priorityFunction):
+    """
+    Expand the open node with the lowest priority first,
+    where priorityFunction(state, pathCost) gives the priority of a node.
+
+    A node is not pushed if the same state is already closed or
+    is already open with a path that is no more expensive.
+    Ties are broken in the order that nodes were pushed.
+    """
+
+    stats = problem.getStats()
+    start = problem.startingState()
+    counter = itertools.count()
+
+    closed = {}
+    bestCosts = {start: 0}
+    frontier = [(priorityFunction(start, 0), next(counter), start, None, None, 0)]
+
+    try:
+        while (len(frontier) > 0):
+            priority, index, state, parent, action, cost = heapq.heappop(frontier)
+            if (state in closed):
+                continue
+
+            closed[state] = (parent, action)
+            if (problem.isGoal(state)):
+                return _buildPath(closed, state)
+
+            for (successor, successorAction, stepCost) in _getSuccessors(problem, state, stats):
+                if (successor in closed):
+                    continue
+
+                successorCost = cost + stepCost
+
+                bestCost = bestCosts.get(successor)
+                if (bestCost is not None and bestCost <= successorCost):
+                    continue
+
+                bestCosts[successor] = successorCost
+                heapq.heappush(frontier, (priorityFunction(successor, successorCost),
+                        next(counter), successor, state, successorAction, successorCost))
+
+            if (len(frontier) > stats.maxFrontier):
+                stats.maxFrontier = len(frontier)
+
+        return None
+    finally:
+        stats.closedSize = len(closed)
+
+def _boundedDepthFirstSearch(problem, heuristic, start, bound, maxNodes, stats):
+    """
+    A single iteration of `idastar`.
+    Returns the actions to a goal (or None) and the smallest value that was over the bound.
+    """
+
+    nextBound = float('inf')
+
+    transpositions = {start: 0}
+    onPath = {start}
+    actions = []
+
+    # Each frame is a state on the current path, its cost, and the successors left to try.
+    frames = [(start, 0, iter(_getSuccessors(problem, start, stats)))]
+
+    try:
+        while (len(frames) > 0):
+            state, cost, successors = frames[-1]
+
+            child = None
+            for (successor, action, stepCost) in successors:
+                if (successor in onPath):
+                    continue
+
+                successorCost = cost + stepCost
+
+                seenCost = transpositions.get(successor)
+                if (seenCost is not None and seenCost <= successorCost):
+                    continue
+
+                value = successorCost + heuristic(successor)
+                if (value > bound):
+                    nextBound = min(nextBound, value)
+                    continue
+
+                if (seenCost is not None or len(transpositions) < maxNodes):
+                    transpositions[successor] = successorCost
+
+                child = (successor, action, successorCost)
+                break
+
+            if (child is None):
+                frames.pop()
+                onPath.discard(state)
+                if (len(actions) > 0):
+                    actions.pop()
+
+                continue
+
+            successor, action, successorCost = child
+            actions.append(action)
+
+            if (problem.isGoal(successor)):
+                return actions, bound
+
+            onPath.add(successor)
+            frames.append((successor, successorCost,
+                    iter(_getSuccessors(problem, successor, stats))))
+
+            if (len(frames) > stats.maxFrontier):
+                stats.maxFrontier = len(frames)
+
+        return None, nextBound
+    finally:
+        stats.closedSize = max(stats.closedSize, len(transpositions))
+
+def _buildNodePath(node):
+    """
+    Follow the parents of a `_MemoryNode` back to the start, and return the actions taken.
+    """
+
+    actions = []
+
+    while (node.parent is not None):
+        actions.append(node.action)
+        node = node.parent
+
+    actions.reverse()
+    return actions
+
+def _buildPath(parents, state):
+    """
+    Follow the parent pointers from state back to the start, and return the actions taken.
+    """
+
+    actions = []
+
+    parent, action = parents[state]
+    while (parent is not None):
+        actions.append(action)
+        parent, action = parents[parent]
+
+    actions.reverse()
+    return actions
+
+def _getHeuristic(problem, heuristic, cacheHeuristic):
+    """
+    Get a function of just a state that gives the heuristic value of that state.
+    Calls to the heuristic are counted and timed in the problem's stats.
+    """
+
+    stats = problem.getStats()
+
+    def timedHeuristic(state):
+        startTime = time.perf_counter()
+        value = heuristic(state, problem)
+
+        stats.heuristicTime += time.perf_counter() - startTime
+        stats.heuristicCalls += 1
+
+        return value
+
+    if (not cacheHeuristic):
+        return timedHeuristic
+
+    cache = {}
+
+    def cachedHeuristic(state):
+        value = cache.get(state)
+        if (value is None):
+            value = timedHeuristic(state)
+            cache[state] = value
+
+        return value
+
+    return cachedHeuristic
+
+def _getSuccessors(problem, state, stats):
+    """
+    Get the successors of a state, counting and timing them in the stats.
+    """
+
+    startTime = time.perf_counter()
+    successors = problem.successorStates(state)
+
+    stats.successorTime += time.perf_counter() - startTime
+    stats.generated += len(successors)
+
+    return successors
+
+def _forgetNode(node, frontier, memory):
+    """
+    Remove a leaf node (one without children) that is not in the frontier from memory,
+    backing its value up into its parent (which is then opened with that value).
+    Parents left without children or anything to regenerate are dead ends, and are forgotten too.
+    Returns the number of nodes that were removed.
+    """
+
+    numRemoved = 0
+
+    while (True):
+        if (memory.get(node.state) is node):
+            del memory[node.state]
+
+        numRemoved += 1
+
+        parent = node.parent
+        parent.numChildren -= 1
+
+        if (parent.forgotten is None):
+            parent.forgotten = {}
+
+        parent.forgotten[node.state] = node.value
+        bestForgotten = min(parent.forgotten.values())
+
+        if (parent.numChildren == 0):
+            # The parent is a leaf again, bounded by its forgotten children.
+            parent.value = max(parent.value, bestForgotten)
+
+        if (bestForgotten != float('inf')):
+            frontier.push(parent, bestForgotten)
+            break
+
+        if (parent.numChildren > 0):
+            break
+
+        if (parent.parent is None):
+            # The whole search space is a dead end.
+            frontier.push(parent, float('inf'))
+            break
+
+        node = parent
+
+    return numRemoved
+
+class _MemoryNode(object):
+    """
+    A search node in `smastar`.
+    """
+
+    __slots__ = ('state', 'parent', 'action', 'cost', 'value', 'depth',
+            'numChildren', 'forgotten', 'priority', 'isOpen', 'version')
+
+    def __init__(self, state, parent, action, cost, value, depth):
+        self.state = state
+        self.parent = parent
+        self.action = action
+        self.cost = cost
+
+        # The lower bound on the cost of a path to a goal through this node.
+        self.value = value
+
+        self.depth = depth
+
+        # The number of children in memory,
+        # and the backed up values of the children that were forgotten (by state).
+        self.numChildren = 0
+        self.forgotten = None
+
+        # The value this node is open with (if it is in the frontier).
+        self.priority = value
+        self.isOpen = False
+
+        # Bumped every time this node enters or leaves the frontier,
+        # so stale heap entries can be recognized.
+        self.version = 0
+
+class _MemoryFrontier(object):
+    """
+    The open nodes of `smastar`.
+    Nodes can be taken from either end:
+    the best node (lowest value, deepest first) or the worst leaf (highest value, shallowest first).
+
+    This is a pair of heaps where replaced or removed entries are only marked stale
+    (by the node's version) and skipped when they reach the top.
+    """
+
+    def __init__(self):
+        self._best = []
+        self._worst = []
+        self._size = 0
+        self._counter = itertools.count()
+
+    def push(self, node, priority):
+        """
+        Open a node with the given priority,
+        or change its priority if it is already open.
+        """
+
+        if (not node.isOpen):
+            node.isOpen = True
+            self._size += 1
+
+        node.version += 1
+        node.priority = priority
+
+        index = next(self._counter)
+        heapq.heappush(self._best, (priority, -node.depth, index, node.version, node))
+        heapq.heappush(self._worst, (-priority, node.depth, index, node.version, node))
+
+        # Do not let the stale entries pile up.
+        if (len(self._best) > 4 * self._size + 64):
+            self._compact()
+
+    def popBest(self):
+        while (True):
+            entry = heapq.heappop(self._best)
+            if (self._isCurrent(entry)):
+                return self._remove(entry[4])
+
+    def popWorstLeaf(self):
+        """
+        Remove and return the worst open node that has no children in memory,
+        or None if there is no such node.
+        The start and the best open node (the next one to be expanded) are never returned,
+        so the search always makes progress.
+        """
+
+        best = self._peekBest()
+        skipped = []
+        leaf = None
+
+        while (len(self._worst) > 0):
+            entry = heapq.heappop(self._worst)
+            if (not self._isCurrent(entry)):
+                continue
+
+            node = entry[4]
+            if (node.numChildren == 0 and node.parent is not None and node is not best):
+                leaf = self._remove(node)
+                break
+
+            skipped.append(entry)
+
+        for entry in skipped:
+            heapq.heappush(self._worst, entry)
+
+        return leaf
+
+    def _compact(self):
+        self._best = [entry for entry in self._best if self._isCurrent(entry)]
+        self._worst = [entry for entry in self._worst if self._isCurrent(entry)]
+
+        heapq.heapify(self._best)
+        heapq.heapify(self._worst)
+
+    def _peekBest(self):
+        while (len(self._best) > 0):
+            if (self._isCurrent(self._best[0])):
+                return self._best[0][4]
+
+            heapq.heappop(self._best)
+
+        return None
+
+    def _isCurrent(self, entry):
+        node = entry[4]
+        return (node.isOpen and entry[3] == node.version)
+
+    def _remove(self, node):
+        node.isOpen = False
+        node.version += 1
+        self._size -= 1
+
+        return node
+
+    def __len__(self):
+        return self._size
@@ -1,5 +1,6 @@
 from pacai.core.actions import Actions
-from pacai.core.directions import Directions
+from pacai.core.search.bitmask import BitmaskIndex
+from pacai.core.search.bitmask import BitmaskState
 from pacai.core.search.problem import SearchProblem
 
 class FoodSearchProblem(SearchProblem):
@@ -7,25 +8,31 @@ class FoodSearchProblem(SearchProblem):
     A search problem associated with finding the a path that collects all of the
     food in a pacman game.
 
-    A search state in this problem is a tuple (pacmanPosition, foodGrid).
-    Wwhere pacmanPosition is a tuple (x, y) of integers specifying Pacman's position,
-    and foodGrid is a `pacai.core.grid.Grid` of either `True` or `False`,
-    specifying remaining food.
+    A search state in this problem is a `pacai.core.search.bitmask.BitmaskState`:
+    Pacman's cell id and a bitmask of the remaining food (over the food at the start).
+    It can still be used like a tuple (pacmanPosition, foodGrid),
+    where pacmanPosition is a tuple (x, y) of integers specifying Pacman's position,
+    and foodGrid is a read-only `pacai.core.search.bitmask.BitmaskSet`
+    that supports `asList()` and `count()` like a `pacai.core.grid.Grid`.
     """
 
     def __init__(self, startingGameState):
         super().__init__()
 
-        self.start = (startingGameState.getPacmanPosition(), startingGameState.getFood())
         self.walls = startingGameState.getWalls()
+        self.graph = startingGameState.getInitialLayout().getGraph()
         self.startingGameState = startingGameState
         self.heuristicInfo = {}  # A dictionary for the heuristic to store information
 
+        self.foodIndex = BitmaskIndex(self.graph, startingGameState.getFood().asList())
+        self.start = BitmaskState(self.graph.getCellId(startingGameState.getPacmanPosition()),
+                self.foodIndex.getFullMask(), self.foodIndex)
+
     def startingState(self):
         return self.start
 
     def isGoal(self, state):
-        return state[1].count() == 0
+        return state.mask == 0
 
     def successorStates(self, state):
         """
@@ -34,14 +41,11 @@ class FoodSearchProblem(SearchProblem):
 
         successors = []
         self._numExpanded += 1
-        for direction in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]:
-            x, y = state[0]
-            dx, dy = Actions.directionToVector(direction)
-            nextx, nexty = int(x + dx), int(y + dy)
-            if not self.walls[nextx][nexty]:
-                nextFood = state[1].copy()
-                nextFood[nextx][nexty] = False
-                successors.append((((nextx, nexty), nextFood), direction, 1))
+
+        food = state.mask
+        for nextCellId, direction in self.graph.getSuccessorIds(state.cellId):
+            nextFood = food & ~self.foodIndex.getCellBit(nextCellId)
+            successors.append((BitmaskState(nextCellId, nextFood, self.foodIndex), direction, 1))
 
         return successors
 
@@ -3,7 +3,15 @@ A heuristic function estimates the cost from the current state to the nearest
 goal in the provided `pacai.core.search.problem.SearchProblem`.
 """
 
+import collections
+
 from pacai.core import distance
+from pacai.core.distanceCalculator import getRegistry
+from pacai.core.search.bitmask import BitmaskState
+
+# The most food sets that each food heuristic remembers results for (per problem),
+# see foodMST() and foodFarthestPair().
+MAX_FOOD_HEURISTIC_ENTRIES = 100000
 
 def null(state, problem = None):
     """
@@ -38,3 +46,131 @@ def numFood(state, problem):
     """
 
     return state[1].count()
+
+def foodMST(state, problem):
+    """
+    This heuristic is the maze distance to the nearest food
+    plus the total maze distance of a minimum spanning tree over all of the remaining food.
+    Pacman has to reach some food and then connect all of the food, so this is admissible
+    (and consistent).
+
+    This works on `pacai.core.search.food.FoodSearchProblem` (or any problem with
+    (pacmanPosition, foodGrid) states and a startingGameState).
+    Distances come from the shared maze distance table of the layout,
+    and spanning tree weights are remembered (by the remaining food) in problem.heuristicInfo.
+    """
+
+    table = _getFoodDistanceTable(problem)
+    pacman, key, food = _getFoodState(state, table)
+
+    if (len(food) == 0):
+        return 0
+
+    weight = _getFoodMemo(problem, 'foodMST', key, lambda: _spanningTreeWeight(table, food))
+    return _nearestDistance(table, pacman, food) + weight
+
+def foodFarthestPair(state, problem):
+    """
+    This heuristic looks at the two remaining food that are the farthest apart (by maze distance).
+    Pacman has to reach one of them and then get to the other one,
+    so this is the distance between them plus the distance to the closer one.
+
+    This works on the same problems as `foodMST`,
+    and the farthest pair is remembered (by the remaining food) in problem.heuristicInfo.
+    """
+
+    table = _getFoodDistanceTable(problem)
+    pacman, key, food = _getFoodState(state, table)
+
+    if (len(food) == 0):
+        return 0
+
+    first, second, pairDistance = _getFoodMemo(problem, 'foodFarthestPair', key,
+            lambda: _farthestPair(table, food))
+
+    return pairDistance + min(table.getDistanceById(pacman, first),
+            table.getDistanceById(pacman, second))
+
+def _farthestPair(table, cellIds):
+    """
+    Get the two cells that are the farthest apart, and their distance.
+    """
+
+    best = (cellIds[0], cellIds[0], 0)
+
+    for i in range(len(cellIds)):
+        for j in range(i + 1, len(cellIds)):
+            pairDistance = table.getDistanceById(cellIds[i], cellIds[j])
+            if (pairDistance > best[2]):
+                best = (cellIds[i], cellIds[j], pairDistance)
+
+    return best
+
+def _getFoodDistanceTable(problem):
+    table = problem.heuristicInfo.get('distanceTable')
+    if (table is None):
+        table = getRegistry().getTable(problem.startingGameState.getInitialLayout())
+        problem.heuristicInfo['distanceTable'] = table
+
+    return table
+
+def _getFoodMemo(problem, name, key, compute):
+    """
+    Get a remembered value for the given food, computing it if it is not remembered.
+    Each heuristic remembers the MAX_FOOD_HEURISTIC_ENTRIES most recently used values.
+    """
+
+    memo = problem.heuristicInfo.get(name)
+    if (memo is None):
+        memo = collections.OrderedDict()
+        problem.heuristicInfo[name] = memo
+
+    value = memo.get(key)
+    if (value is not None):
+        memo.move_to_end(key)
+        return value
+
+    value = compute()
+
+    memo[key] = value
+    if (len(memo) > MAX_FOOD_HEURISTIC_ENTRIES):
+        memo.popitem(last = False)
+
+    return value
+
+def _getFoodState(state, table):
+    """
+    Get Pacman's cell id, a key for the remaining food, and the cell ids of the remaining food.
+    """
+
+    if (isinstance(state, BitmaskState)):
+        return state.cellId, state.mask, state.getIndex().toCellIds(state.mask)
+
+    graph = table.getGraph()
+    position, foodGrid = state
+
+    food = [graph.getCellId(foodPosition) for foodPosition in foodGrid.asList()]
+    return graph.getCellId(position), foodGrid, food
+
+def _nearestDistance(table, source, cellIds):
+    return min(table.getDistanceById(source, cellId) for cellId in cellIds)
+
+def _spanningTreeWeight(table, cellIds):
+    """
+    Get the total distance of a minimum spanning tree over the cells (Prim's algorithm).
+    """
+
+    # The distance from each cell outside of the tree to the closest cell in the tree.
+    closest = {cellId: table.getDistanceById(cellIds[0], cellId) for cellId in cellIds[1:]}
+    weight = 0
+
+    while (len(closest) > 0):
+        cellId = min(closest, key = closest.get)
+        weight += closest.pop(cellId)
+
+        for other in closest:
+            otherDistance = table.getDistanceById(cellId, other)
+            if (otherDistance < closest[other]):
+                closest[other] = otherDistance
+
+    return weight
@@ -0,0 +1,131 @@
+import itertools
+
+from pacai.core.search.position import DEFAULT_COST_FUNCTION
+from pacai.core.search.position import DEFAULT_GOAL_POSITION
+from pacai.core.search.position import PositionSearchProblem
+
+class JunctionSearchProblem(PositionSearchProblem):
+    """
+    A `pacai.core.search.position.PositionSearchProblem` that moves from junction to junction
+    (see `pacai.core.junctiongraph.JunctionGraph`) instead of one cell at a time,
+    so a search does not expand every cell along a corridor.
+
+    States are still (x, y) positions, but only junctions, the start, and the goal are reached.
+    Each action is a tuple of the `pacai.core.directions.Directions` along a corridor,
+    `JunctionSearchProblem.expandActions` turns a path of them back into single directions
+    (`pacai.agents.search.base.SearchAgent` does this for you).
+    The goal must be a single position.
+    """
+
+    def __init__(self, gameState, costFn = DEFAULT_COST_FUNCTION,
+            goal = DEFAULT_GOAL_POSITION, start = None):
+        super().__init__(gameState, costFn = costFn, goal = goal, start = start)
+
+        self.junctionGraph = gameState.getInitialLayout().getJunctionGraph()
+
+        # Corridor cells that a search still has to be able to stop at.
+        self._stops = set()
+        for position in (self.startState, self.goal):
+            cellId = self.graph.getCellId(position)
+            if (cellId is not None and not self.junctionGraph.isJunction(cellId)):
+                self._stops.add(cellId)
+
+        # The edges (cut short at the stops) leaving the stops and the junctions around them.
+        self._edges = {}
+        for stop in self._stops:
+            edges = self._cutEdges(self.junctionGraph.getEdges(stop))
+            self._edges[stop] = edges
+
+            for (junction, cells, actions) in self.junctionGraph.getEdges(stop):
+                if (junction not in self._edges):
+                    self._edges[junction] = self._cutEdges(self.junctionGraph.getEdges(junction))
+
+    def actionsCost(self, actions):
+        """
+        Returns the cost of a particular sequence of actions,
+        which may be corridor actions (tuples of directions), single directions, or a mix of both.
+        If those actions include an illegal move, return 999999.
+        """
+
+        if (actions is None):
+            return 999999
+
+        directions = []
+        for action in actions:
+            if (isinstance(action, tuple)):
+                directions.extend(action)
+            else:
+                directions.append(action)
+
+        return super().actionsCost(directions)
+
+    def expandActions(self, actions):
+        if (actions is None):
+            return None
+
+        return list(itertools.chain.from_iterable(actions))
+
+    def predecessorStates(self, state):
+        """
+        Returns the states that can reach this state along a single corridor,
+        the actions that they require to get here, and the cost of those moves.
+        """
+
+        predecessors = []
+        cellId = self.graph.getCellId(state)
+
+        for edge in self._getEdges(cellId):
+            source, cells, actions = self.junctionGraph.reverseEdge(cellId, edge)
+            predecessors.append((self.graph.getPosition(edge[0]), actions, self._edgeCost(cells)))
+
+        self._recordExpansion(state)
+
+        return predecessors
+
+    def successorStates(self, state):
+        """
+        Returns the states at the other ends of the corridors leaving this state,
+        the actions that walk each corridor, and the cost of walking it.
+        """
+
+        successors = []
+        cellId = self.graph.getCellId(state)
+
+        for (target, cells, actions) in self._getEdges(cellId):
+            successors.append((self.graph.getPosition(target), actions, self._edgeCost(cells)))
+
+        self._recordExpansion(state)
+
+        return successors
+
+    def _cutEdges(self, edges):
+        """
+        Cut each edge short at the first stop along it.
+        """
+
+        cutEdges = []
+
+        for (target, cells, actions) in edges:
+            for i in range(len(cells) - 1):
+                if (cells[i] in self._stops):
+                    target = cells[i]
+                    cells = cells[:i + 1]
+                    actions = actions[:i + 1]
+                    break
+
+            cutEdges.append((target, cells, actions))
+
+        return tuple(cutEdges)
+
+    def _edgeCost(self, cells):
+        if (self.costFn is DEFAULT_COST_FUNCTION):
+            return len(cells)
+
+        return sum(self.costFn(self.graph.getPosition(cellId)) for cellId in cells)
+
+    def _getEdges(self, cellId):
+        edges = self._edges.get(cellId)
+        if (edges is None):
+            edges = self.junctionGraph.getEdges(cellId)
+
+        return edges
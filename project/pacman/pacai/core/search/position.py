@@ -24,6 +24,7 @@ class PositionSearchProblem(SearchProblem):
         super().__init__()
 
         self.walls = gameState.getWalls()
+        self.graph = gameState.getInitialLayout().getGraph()
         self.goal = goal
         self.costFn = costFn
 
@@ -51,6 +52,34 @@ class PositionSearchProblem(SearchProblem):
 
         return True
 
+    def predecessorStates(self, state):
+        """
+        Returns the states that can reach this state in one move,
+        the actions that they require to get here, and the cost of those moves.
+        This lets searches work backwards from the goal (see `pacai.core.search.engine`).
+        """
+
+        predecessors = []
+        cost = self.costFn(state)
+
+        neighbors = self.graph.getSuccessors(state)
+        if (neighbors is not None):
+            for previousState, action in neighbors:
+                predecessors.append((previousState, Actions.reverseDirection(action), cost))
+        else:
+            for action in Directions.CARDINAL:
+                x, y = state
+                dx, dy = Actions.directionToVector(action)
+                previousx, previousy = int(x + dx), int(y + dy)
+
+                if (not self.walls[previousx][previousy]):
+                    previousState = (previousx, previousy)
+                    predecessors.append((previousState, Actions.reverseDirection(action), cost))
+
+        self._recordExpansion(state)
+
+        return predecessors
+
     def successorStates(self, state):
         """
         Returns successor states, the actions they require, and a constant cost of 1.
@@ -58,17 +87,28 @@ class PositionSearchProblem(SearchProblem):
 
         successors = []
 
-        for action in Directions.CARDINAL:
-            x, y = state
-            dx, dy = Actions.directionToVector(action)
-            nextx, nexty = int(x + dx), int(y + dy)
+        neighbors = self.graph.getSuccessors(state)
+        if (neighbors is not None):
+            for nextState, action in neighbors:
+                successors.append((nextState, action, self.costFn(nextState)))
+        else:
+            # The state is not a cell of the graph (e.g. it is not on a grid point).
+            for action in Directions.CARDINAL:
+                x, y = state
+                dx, dy = Actions.directionToVector(action)
+                nextx, nexty = int(x + dx), int(y + dy)
 
-            if (not self.walls[nextx][nexty]):
-                nextState = (nextx, nexty)
-                cost = self.costFn(nextState)
+                if (not self.walls[nextx][nexty]):
+                    nextState = (nextx, nexty)
+                    cost = self.costFn(nextState)
 
-                successors.append((nextState, action, cost))
+                    successors.append((nextState, action, cost))
 
+        self._recordExpansion(state)
+
+        return successors
+
+    def _recordExpansion(self, state):
         # Bookkeeping for display purposes (the highlight in the GUI).
         self._numExpanded += 1
         if (state not in self._visitedLocations):
@@ -78,8 +118,6 @@ class PositionSearchProblem(SearchProblem):
             coordinates = state
             self._visitHistory.append(coordinates)
 
-        return successors
-
     def actionsCost(self, actions):
         """
         Returns the cost of a particular sequence of actions.
@@ -1,5 +1,7 @@
 import abc
 
+from pacai.core.search.stats import SearchStats
+
 class SearchProblem(abc.ABC):
     """
     This class outlines the structure of a search problem.
@@ -32,6 +34,9 @@ class SearchProblem(abc.ABC):
         self._visitedLocations = set()
         self._visitHistory = []
 
+        # Statistics about the search on this problem.
+        self._stats = SearchStats()
+
     @abc.abstractmethod
     def actionsCost(self, actions):
         """
@@ -43,9 +48,26 @@ class SearchProblem(abc.ABC):
 
         pass
 
+    def expandActions(self, actions):
+        """
+        Turn the actions of a path found by a search into the actions an agent takes.
+        Most problems already use agent actions, so this returns the actions unchanged.
+        Problems with compound actions (like `pacai.core.search.junction.JunctionSearchProblem`)
+        flatten them here.
+        """
+
+        return actions
+
     def getExpandedCount(self):
         return self._numExpanded
 
+    def getStats(self):
+        """
+        Get the `pacai.core.search.stats.SearchStats` for the search on this problem.
+        """
+
+        return self._stats
+
     def getVisitHistory(self):
         return self._visitHistory
 
@@ -0,0 +1,94 @@
+"""
+Statistics about a single run of a search.
+"""
+
+import csv
+import json
+import os
+
+class SearchStats(object):
+    """
+    Numbers describing how a search went.
+    Every `pacai.core.search.problem.SearchProblem` has one (see `getStats`),
+    which the problem, the searches in `pacai.core.search.engine`,
+    and `pacai.agents.search.base.SearchAgent` fill in.
+
+    Searches that do not know about these stats (like the ones in `pacai.student.search`)
+    will leave most of the numbers at zero.
+    Times are in seconds and memory is in bytes.
+    """
+
+    # All the fields, in the order they are exported.
+    FIELDS = [
+        'problem',
+        'function',
+        'pathLength',
+        'pathCost',
+        'expanded',
+        'generated',
+        'maxFrontier',
+        'closedSize',
+        'heuristicCalls',
+        'heuristicTime',
+        'successorTime',
+        'wallTime',
+        'peakMemory',
+    ]
+
+    def __init__(self):
+        # The names of the problem and search function.
+        self.problem = None
+        self.function = None
+
+        # The path that was found.
+        self.pathLength = None
+        self.pathCost = None
+
+        # Nodes whose successors were generated, and successors that were generated.
+        self.expanded = 0
+        self.generated = 0
+
+        # The largest the frontier got, and the number of closed (or seen) states at the end.
+        self.maxFrontier = 0
+        self.closedSize = 0
+
+        self.heuristicCalls = 0
+        self.heuristicTime = 0.0
+
+        # The time spent generating successors.
+        self.successorTime = 0.0
+
+        # The time the whole search took.
+        self.wallTime = 0.0
+
+        # The peak memory allocated during the search (None if memory was not traced).
+        self.peakMemory = None
+
+    def toDict(self):
+        return {field: getattr(self, field) for field in SearchStats.FIELDS}
+
+    def writeCSV(self, path):
+        """
+        Append these stats as a row of a CSV file,
+        writing a header first if the file is new (or empty).
+        """
+
+        writeHeader = (not os.path.isfile(path) or os.path.getsize(path) == 0)
+
+        with open(path, 'a', newline = '') as file:
+            writer = csv.DictWriter(file, fieldnames = SearchStats.FIELDS)
+            if (writeHeader):
+                writer.writeheader()
+
+            writer.writerow(self.toDict())
+
+    def writeJSON(self, path):
+        """
+        Write these stats to a file as a JSON object.
+        """
+
+        with open(path, 'w') as file:
+            json.dump(self.toDict(), file, indent = 4)
+
+    def __str__(self):
+        return json.dumps(self.toDict())
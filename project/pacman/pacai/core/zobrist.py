@@ -0,0 +1,51 @@
+"""
+Zobrist hashing for the board contents of a game state.
+
+Every cell gets a random key for "has food" and another for "has a capsule".
+The hash of a board is the XOR of the keys of everything on it,
+so eating a pellet or capsule updates the hash with a single XOR.
+"""
+
+import random
+
+KEY_BITS = 64
+
+class ZobristTable(object):
+    """
+    The random keys for a single layout.
+    Keys are seeded from the layout text, so the same layout always gets the same keys.
+
+    Tables are built once per `pacai.core.layout.Layout`,
+    see `pacai.core.layout.Layout.getZobristTable`.
+    """
+
+    def __init__(self, layout):
+        self._height = layout.height
+
+        rng = random.Random('\n'.join(layout.layoutText))
+        numCells = layout.width * layout.height
+
+        self._foodKeys = [rng.getrandbits(KEY_BITS) for i in range(numCells)]
+        self._capsuleKeys = [rng.getrandbits(KEY_BITS) for i in range(numCells)]
+
+    def capsuleKey(self, x, y):
+        return self._capsuleKeys[x * self._height + y]
+
+    def foodKey(self, x, y):
+        return self._foodKeys[x * self._height + y]
+
+    def hashBoard(self, food, capsules):
+        """
+        Compute the hash of a board from scratch.
+        `food` is a `pacai.core.grid.Grid` and `capsules` is a list of positions.
+        """
+
+        hashCode = 0
+
+        for (x, y) in food.asList():
+            hashCode ^= self.foodKey(x, y)
+
+        for (x, y) in capsules:
+            hashCode ^= self.capsuleKey(x, y)
+
+        return hashCode
@@ -53,7 +53,7 @@ class ReflexAgent(BaseAgent):
         """
 
         # print(action)
-        successorGameState = currentGameState.generatePacmanSuccessor(action)
+        successorGameState = currentGameState.generatePacmanSuccessor(action, validate = False)
 
         # Useful information you can extract.
         newPosition = successorGameState.getPacmanPosition()
@@ -72,7 +72,7 @@ class ReflexAgent(BaseAgent):
         if all_scared:
             return successorGameState.getScore() + 100
 
-        newFood = successorGameState.getFood().asList()
+        newFood = successorGameState.getFoodPositions()
         nearest_food_dist = float("inf")
         nearest_food = None
         for food in newFood:
@@ -126,6 +126,10 @@ class MinimaxAgent(MultiAgentSearchAgent):
     `pacai.core.gamestate.AbstractGameState.generateSuccessor`:
     Get the successor game state after an agent takes an action.
 
+    `pacai.core.gamestate.AbstractGameState.applyMove`:
+    Take an action in place instead of creating a successor game state,
+    `pacai.core.gamestate.AbstractGameState.undoMove` takes it back.
+
     `pacai.core.directions.Directions.STOP`:
     The stop direction, which is always legal, but you may not want to include in your search.
 
@@ -174,7 +178,6 @@ class MinimaxAgent(MultiAgentSearchAgent):
         legal_actions = state.getLegalActions(index)
 
         for action in legal_actions:
-            successor = state.generateSuccessor(index, action)
             new_index = index + 1
             new_depth = depth
 
@@ -182,7 +185,13 @@ class MinimaxAgent(MultiAgentSearchAgent):
             if new_index == agent_num:
                 new_index = new_index % agent_num
                 new_depth += 1
-            temp_val = (self.getValue(successor, new_index, new_depth)[0], action)
+
+            # Search the successor in place, and put the state back afterwards.
+            record = state.applyMove(index, action, validate = False)
+            try:
+                temp_val = (self.getValue(state, new_index, new_depth)[0], action)
+            finally:
+                state.undoMove(record)
             if temp_val[0] >= max_val[0]:
                 max_val = temp_val
 
@@ -193,7 +202,6 @@ class MinimaxAgent(MultiAgentSearchAgent):
         agent_num = state.getNumAgents()
         legal_actions = state.getLegalActions(index)
         for action in legal_actions:
-            successor = state.generateSuccessor(index, action)
             new_index = index + 1
             new_depth = depth
 
@@ -201,7 +209,13 @@ class MinimaxAgent(MultiAgentSearchAgent):
             if new_index == agent_num:
                 new_index = new_index % agent_num
                 new_depth += 1
-            temp_val = (self.getValue(successor, new_index, new_depth)[0], action)
+
+            # Search the successor in place, and put the state back afterwards.
+            record = state.applyMove(index, action, validate = False)
+            try:
+                temp_val = (self.getValue(state, new_index, new_depth)[0], action)
+            finally:
+                state.undoMove(record)
             if temp_val[0] <= min_val[0]:
                 min_val = temp_val
 
@@ -254,7 +268,7 @@ class AlphaBetaAgent(MultiAgentSearchAgent):
         legal_actions = state.getLegalActions(index)
 
         for action in legal_actions:
-            successor = state.generateSuccessor(index, action)
+            successor = state.generateSuccessor(index, action, validate = False)
             new_index = index + 1
             new_depth = depth
 
@@ -284,7 +298,7 @@ class AlphaBetaAgent(MultiAgentSearchAgent):
         agent_num = state.getNumAgents()
         legal_actions = state.getLegalActions(index)
         for action in legal_actions:
-            successor = state.generateSuccessor(index, action)
+            successor = state.generateSuccessor(index, action, validate = False)
             new_index = index + 1
             new_depth = depth
 
@@ -355,7 +369,6 @@ class ExpectimaxAgent(MultiAgentSearchAgent):
         legal_actions = state.getLegalActions(index)
 
         for action in legal_actions:
-            successor = state.generateSuccessor(index, action)
             new_index = index + 1
             new_depth = depth
 
@@ -363,7 +376,13 @@ class ExpectimaxAgent(MultiAgentSearchAgent):
             if new_index == agent_num:
                 new_index = new_index % agent_num
                 new_depth += 1
-            temp_val = (self.getValue(successor, new_index, new_depth)[0], action)
+
+            # Search the successor in place, and put the state back afterwards.
+            record = state.applyMove(index, action, validate = False)
+            try:
+                temp_val = (self.getValue(state, new_index, new_depth)[0], action)
+            finally:
+                state.undoMove(record)
             if temp_val[0] >= max_val[0]:
                 max_val = temp_val
 
@@ -377,7 +396,6 @@ class ExpectimaxAgent(MultiAgentSearchAgent):
         probility = 1.0 / len(legal_actions)
 
         for action in legal_actions:
-            successor = state.generateSuccessor(index, action)
             new_index = index + 1
             new_depth = depth
 
@@ -385,7 +403,13 @@ class ExpectimaxAgent(MultiAgentSearchAgent):
             if new_index == agent_num:
                 new_index = new_index % agent_num
                 new_depth += 1
-            temp_val = (self.getValue(successor, new_index, new_depth)[0], action)
+
+            # Search the successor in place, and put the state back afterwards.
+            record = state.applyMove(index, action, validate = False)
+            try:
+                temp_val = (self.getValue(state, new_index, new_depth)[0], action)
+            finally:
+                state.undoMove(record)
             # if temp_val[0] <= exp_val[0]:
             #     exp_val = temp_val
             # Calculate the expectation for expectimax
@@ -419,7 +443,7 @@ def betterEvaluationFunction(currentGameState):
         else:
             unscared_ghost.append(ghost)
     # print(unscared_ghost)
-    newFood = currentGameState.getFood().asList()
+    newFood = currentGameState.getFoodPositions()
     nearest_food_dist = float("inf")
     for food in newFood:
         if manhattan(newPosition, food) < nearest_food_dist:
@@ -9,9 +9,10 @@ import logging
 from pacai.student.search import uniformCostSearch
 from pacai.core.distance import manhattan, maze
 from pacai.core.actions import Actions
+from pacai.core.search.bitmask import BitmaskIndex
+from pacai.core.search.bitmask import BitmaskState
 from pacai.core.search.position import PositionSearchProblem
 from pacai.core.search.problem import SearchProblem
-from pacai.core.directions import Directions
 
 from pacai.agents.base import BaseAgent
 from pacai.agents.search.base import SearchAgent
@@ -56,6 +57,7 @@ class CornersProblem(SearchProblem):
         super().__init__()
 
         self.walls = startingGameState.getWalls()
+        self.graph = startingGameState.getInitialLayout().getGraph()
         self.startingPosition = startingGameState.getPacmanPosition()
         top = self.walls.getHeight() - 2
         right = self.walls.getWidth() - 2
@@ -66,36 +68,29 @@ class CornersProblem(SearchProblem):
                 logging.warning("Warning: no food in corner " + str(corner))
 
         # *** Your Code Here ***
-        self.starting_state = (self.startingPosition, [])
+        # State = (cell id, bitmask of visited corners),
+        # which still unpacks as (position, visited corners).
+        self.cornerIndex = BitmaskIndex(self.graph, self.corners)
+        self.starting_state = BitmaskState(self.graph.getCellId(self.startingPosition),
+                self.cornerIndex.getCellBit(self.graph.getCellId(self.startingPosition)),
+                self.cornerIndex)
         # raise NotImplementedError()
 
     def startingState(self):
         return self.starting_state
 
     def isGoal(self, state):
-        return len(state[1]) == 4  # If all four corners have been visted
+        # If all four corners have been visted
+        return state.mask == self.cornerIndex.getFullMask()
 
     def successorStates(self, state):
         successors = []
-        curr_pos = state[0]
 
-        # Successor = ((nextX, nextY), visited corners)
-        for action in Directions.CARDINAL:
-            x, y = curr_pos
-            dx, dy = Actions.directionToVector(action)
-            next_x, next_y = int(x + dx), int(y + dy)
-            hitsWall = self.walls[next_x][next_y]
-
-            if not hitsWall:
-                # Build successors
-                visited_corner = state[1].copy()
-                if (next_x, next_y) in self.corners and (
-                        next_x,
-                        next_y,
-                ) not in visited_corner:
-                    visited_corner.append((next_x, next_y))
-                next_state = ((next_x, next_y), visited_corner)
-                successors.append((next_state, action, 1))
+        # Successor = (next cell id, visited corners + the next cell if it is a corner)
+        for next_id, action in self.graph.getSuccessorIds(state.cellId):
+            visited_corners = state.mask | self.cornerIndex.getCellBit(next_id)
+            next_state = BitmaskState(next_id, visited_corners, self.cornerIndex)
+            successors.append((next_state, action, 1))
         # Expand node +1
         self._numExpanded += 1
         return successors
@@ -175,9 +170,10 @@ def foodHeuristic(state, problem):
     On the other hand, inadmissible or inconsistent heuristics may find optimal solutions,
     so be careful.
 
-    The state is a tuple (pacmanPosition, foodGrid) where foodGrid is a
-    `pacai.core.grid.Grid` of either True or False.
-    You can call `foodGrid.asList()` to get a list of food coordinates instead.
+    The state is a `pacai.core.search.bitmask.BitmaskState`
+    that unpacks into (pacmanPosition, foodGrid), where foodGrid is a
+    `pacai.core.search.bitmask.BitmaskSet` of the remaining food.
+    You can call `foodGrid.asList()` to get a list of food coordinates.
 
     If you want access to info like walls, capsules, etc., you can query the problem.
     For example, `problem.walls` gives you a Grid of where the walls are.
@@ -233,7 +229,7 @@ class ClosestDotSearchAgent(SearchAgent):
 
         currentState = state
 
-        while currentState.getFood().count() > 0:
+        while currentState.getNumFood() > 0:
             nextPathSegment = self.findPathToClosestDot(
                 currentState)  # The missing piece
             self._actions += nextPathSegment
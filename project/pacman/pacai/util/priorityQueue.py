@@ -2,7 +2,9 @@
 Priority queue containers.
 """
 
+import collections
 import heapq
+import itertools
 
 class PriorityQueue(object):
     """
@@ -56,3 +58,214 @@ class PriorityQueueWithFunction(PriorityQueue):
 
     def __len__(self):
         return len(self.heap)
+
+class IndexedPriorityQueue(object):
+    """
+    A priority queue of unique (hashable) items that supports changing the priority of an item
+    that is already in the queue, without leaving a stale copy of the item behind.
+    Items with equal priority are popped in the order they were first pushed.
+
+    This has the same push/pop/isEmpty API as `PriorityQueue`.
+    """
+
+    def __init__(self):
+        # Entries are [priority, insertion order, item].
+        self.heap = []
+
+        # The index of each item's entry in the heap.
+        self._positions = {}
+
+        self._counter = itertools.count()
+
+    def getPriority(self, item):
+        """
+        Get the priority of an item in the queue, or None if the item is not in the queue.
+        """
+
+        position = self._positions.get(item)
+        if (position is None):
+            return None
+
+        return self.heap[position][0]
+
+    def isEmpty(self):
+        return len(self.heap) == 0
+
+    def pop(self):
+        priority, item = self.popWithPriority()
+        return item
+
+    def popWithPriority(self):
+        """
+        Remove the lowest-priority item, and return a (priority, item) tuple.
+        """
+
+        heap = self.heap
+        if (len(heap) == 0):
+            raise IndexError('pop from an empty indexed priority queue')
+
+        entry = heap[0]
+        last = heap.pop()
+        del self._positions[entry[2]]
+
+        if (len(heap) > 0):
+            heap[0] = last
+            self._positions[last[2]] = 0
+            self._siftDown(0)
+
+        return (entry[0], entry[2])
+
+    def push(self, item, priority):
+        """
+        Add an item to the queue.
+        If the item is already in the queue, its priority is set to the new priority.
+        """
+
+        position = self._positions.get(item)
+        if (position is None):
+            self._insert(item, priority)
+            return
+
+        entry = self.heap[position]
+        oldPriority = entry[0]
+        entry[0] = priority
+
+        if (priority < oldPriority):
+            self._siftUp(position)
+        else:
+            self._siftDown(position)
+
+    def update(self, item, priority):
+        """
+        Add an item to the queue, or lower its priority if it is already in the queue.
+        Returns True if the item was added or its priority changed.
+        """
+
+        position = self._positions.get(item)
+        if (position is None):
+            self._insert(item, priority)
+            return True
+
+        entry = self.heap[position]
+        if (entry[0] <= priority):
+            return False
+
+        entry[0] = priority
+        self._siftUp(position)
+        return True
+
+    def _insert(self, item, priority):
+        self.heap.append([priority, next(self._counter), item])
+        self._positions[item] = len(self.heap) - 1
+        self._siftUp(len(self.heap) - 1)
+
+    def _siftDown(self, position):
+        heap = self.heap
+        positions = self._positions
+        size = len(heap)
+        entry = heap[position]
+
+        while (True):
+            child = 2 * position + 1
+            if (child >= size):
+                break
+
+            if (child + 1 < size and _entryLess(heap[child + 1], heap[child])):
+                child += 1
+
+            if (not _entryLess(heap[child], entry)):
+                break
+
+            heap[position] = heap[child]
+            positions[heap[position][2]] = position
+            position = child
+
+        heap[position] = entry
+        positions[entry[2]] = position
+
+    def _siftUp(self, position):
+        heap = self.heap
+        positions = self._positions
+        entry = heap[position]
+
+        while (position > 0):
+            parent = (position - 1) // 2
+            if (not _entryLess(entry, heap[parent])):
+                break
+
+            heap[position] = heap[parent]
+            positions[heap[position][2]] = position
+            position = parent
+
+        heap[position] = entry
+        positions[entry[2]] = position
+
+    def __contains__(self, item):
+        return item in self._positions
+
+    def __len__(self):
+        return len(self.heap)
+
+def _entryLess(entry, other):
+    """
+    Compare two `IndexedPriorityQueue` entries by priority, then insertion order.
+    """
+
+    return (entry[0] < other[0] or (entry[0] == other[0] and entry[1] < other[1]))
+
+class BucketQueue(object):
+    """
+    A priority queue for small non-negative integer priorities (Dial's algorithm).
+    There is one FIFO bucket per priority, so push is constant time and pop is constant time
+    plus the number of empty buckets it skips.
+    This fits searches where every step costs a small integer (like the unit cost Pacman mazes).
+
+    This has the same push/pop/isEmpty API as `PriorityQueue`.
+    Like `PriorityQueue`, the same item may be pushed multiple times.
+    """
+
+    def __init__(self):
+        self._buckets = []
+        self._size = 0
+
+        # No bucket below this one has any items.
+        self._minPriority = 0
+
+    def isEmpty(self):
+        return self._size == 0
+
+    def pop(self):
+        priority, item = self.popWithPriority()
+        return item
+
+    def popWithPriority(self):
+        """
+        Remove the lowest-priority item, and return a (priority, item) tuple.
+        """
+
+        if (self._size == 0):
+            raise IndexError('pop from an empty bucket queue')
+
+        buckets = self._buckets
+        while (len(buckets[self._minPriority]) == 0):
+            self._minPriority += 1
+
+        self._size -= 1
+        return (self._minPriority, buckets[self._minPriority].popleft())
+
+    def push(self, item, priority):
+        if (not isinstance(priority, int) or priority < 0):
+            raise ValueError('Bucket queue priorities must be non-negative integers: '
+                    + str(priority))
+
+        while (len(self._buckets) <= priority):
+            self._buckets.append(collections.deque())
+
+        self._buckets[priority].append(item)
+        self._size += 1
+
+        if (priority < self._minPriority):
+            self._minPriority = priority
+
+    def __len__(self):
+        return self._size
@@ -0,0 +1,317 @@
+import os
+import sys
+import tempfile
+import unittest
+
+from pacai.agents.capture.capture import CaptureAgent
+from pacai.bin.capture import CaptureGameState
+from pacai.bin.pacman import PacmanGameState
+from pacai.core import distanceCalculator
+from pacai.core.actions import Actions
+from pacai.core.distance import maze
+from pacai.core.distanceCalculator import Distancer
+from pacai.core.distanceCalculator import computeDistances
+from pacai.core.layout import Layout
+from pacai.core.layout import getLayout
+
+"""
+Test the maze distances computed by the distancer.
+"""
+class DistanceCalculatorTest(unittest.TestCase):
+    def test_distances(self):
+        for name in ['tinyMaze', 'mediumClassic', 'defaultCapture']:
+            layout = getLayout(name)
+            table = computeDistances(layout)
+            openCells = layout.walls.asList(False)
+
+            for source in openCells[::7]:
+                expected = _bfs(source, layout.walls)
+                for target in openCells:
+                    self.assertEqual(expected[target], table.getDistance(source, target))
+                    self.assertEqual(expected[target], table.getDistance(target, source))
+
+    def test_distancer(self):
+        layout = getLayout('mediumClassic')
+        distancer = Distancer(layout)
+
+        # Before the distances are computed, the manhattan distance is used.
+        self.assertFalse(distancer.isReadyForMazeDistance())
+        self.assertEqual(4, distancer.getDistance((1, 1), (3, 3)))
+
+        distancer.getMazeDistances()
+        self.assertTrue(distancer.isReadyForMazeDistance())
+
+        self.assertEqual(0, distancer.getDistance((1, 1), (1, 1)))
+        self.assertEqual(2, distancer.getDistance((1, 1), (1, 3)))
+        self.assertEqual(2.5, distancer.getDistance((1, 1), (1, 3.5)))
+        self.assertRaises(Exception, distancer.getDistanceOnGrid, (0, 0), (1, 1))
+
+    def test_unreachable(self):
+        layout = Layout([
+            '%%%%%',
+            '%.%.%',
+            '%%%%%',
+        ])
+        table = computeDistances(layout)
+
+        self.assertEqual(0, table.getDistance((1, 1), (1, 1)))
+        self.assertEqual(sys.maxsize, table.getDistance((1, 1), (3, 1)))
+        self.assertIsNone(table.getDistance((1, 1), (2, 1)))
+
+    def test_disk_cache(self):
+        layout = getLayout('mediumClassic')
+        expected = computeDistances(layout)
+        openCells = layout.walls.asList(False)
+
+        with tempfile.TemporaryDirectory() as cacheDir:
+            try:
+                distanceCalculator.setCacheDir(cacheDir)
+
+                Distancer(layout).getMazeDistances()
+                path = os.path.join(cacheDir,
+                        distanceCalculator.wallsDigest(layout.walls) + '.dist')
+                self.assertTrue(os.path.isfile(path))
+
+                # A new layout with the same walls loads the table from disk.
+                distanceCalculator.getRegistry().clear()
+                distancer = Distancer(getLayout('mediumClassic'))
+                distancer.getMazeDistances()
+                self.assertIsInstance(distancer._distances._distances, memoryview)
+
+                for source in openCells[::11]:
+                    for target in openCells:
+                        self.assertEqual(expected.getDistance(source, target),
+                                distancer.getDistance(source, target))
+
+                # Broken files are ignored (and replaced).
+                with open(path, 'wb') as file:
+                    file.write(b'PACD')
+
+                self.assertIsNone(distanceCalculator.loadDistances(layout, cacheDir))
+                distanceCalculator.getRegistry().clear()
+                distancer = Distancer(layout)
+                distancer.getMazeDistances()
+                self.assertEqual(2, distancer.getDistance((1, 1), (1, 3)))
+                self.assertIsNotNone(distanceCalculator.loadDistances(layout, cacheDir))
+            finally:
+                distanceCalculator.setCacheDir(None)
+                distanceCalculator.getRegistry().clear()
+
+    def test_registry(self):
+        registry = distanceCalculator.DistanceRegistry()
+
+        first = registry.getTable(getLayout('mediumClassic'))
+        self.assertIs(first, registry.getTable(getLayout('mediumClassic')))
+        self.assertEqual(first.getSize(), registry.getSize())
+
+        # Distancers share the process-wide registry.
+        distancer1 = Distancer(getLayout('defaultCapture'))
+        distancer2 = Distancer(getLayout('defaultCapture'))
+        distancer1.getMazeDistances()
+        distancer2.getMazeDistances()
+        self.assertIs(distancer1._distances, distancer2._distances)
+
+        # Once the budget is exceeded, the least recently used tables are dropped.
+        second = registry.getTable(getLayout('tinyMaze'))
+        registry.getTable(getLayout('mediumClassic'))
+        registry.setMaxBytes(first.getSize())
+
+        self.assertEqual(1, len(registry))
+        self.assertIn(getLayout('mediumClassic'), registry)
+        self.assertEqual(first.getSize(), registry.getSize())
+
+        # The most recently used table is always kept.
+        registry.setMaxBytes(0)
+        third = registry.getTable(getLayout('tinyMaze'))
+        self.assertIsNot(second, third)
+        self.assertIs(third, registry.getTable(getLayout('tinyMaze')))
+        self.assertEqual(1, len(registry))
+        self.assertEqual(third.getSize(), registry.getSize())
+
+    def test_lazy(self):
+        layout = getLayout('mediumClassic')
+        expected = computeDistances(layout)
+        openCells = layout.walls.asList(False)
+
+        table = distanceCalculator.LazyDistanceTable(layout.getGraph(), maxRows = 4)
+        for source in openCells[::5]:
+            for target in openCells[::3]:
+                self.assertEqual(expected.getDistance(source, target),
+                        table.getDistance(source, target))
+
+        stats = table.getStats()
+        self.assertEqual(4, stats['rows'])
+        self.assertEqual(len(openCells[::5]), stats['misses'])
+        self.assertEqual(stats['misses'] - 4, stats['evictions'])
+
+        # Rows are used in either direction.
+        source, target = openCells[-1], openCells[0]
+        table.getDistance(source, target)
+        hits = table.getStats()['hits']
+        table.getDistance(target, source)
+        self.assertEqual(hits + 1, table.getStats()['hits'])
+
+    def test_mode(self):
+        small = getLayout('mediumClassic')
+        big = Layout(['%' * 62] + ['%' + ' ' * 60 + '%'] * 60 + ['%' * 62])
+
+        self.assertEqual(distanceCalculator.MODE_FULL, distanceCalculator.chooseMode(small))
+        self.assertEqual(distanceCalculator.MODE_LAZY, distanceCalculator.chooseMode(big))
+
+        try:
+            distancer = Distancer(big)
+            distancer.getMazeDistances()
+            self.assertEqual(118, distancer.getDistance((1, 1), (60, 60)))
+            self.assertEqual(1, distancer.getStats()['misses'])
+
+            distancer = Distancer(small, mode = distanceCalculator.MODE_LAZY)
+            distancer.getMazeDistances()
+            self.assertEqual(2, distancer.getDistance((1, 1), (1, 3)))
+            self.assertEqual(1, distancer.getStats()['rows'])
+
+            distancer = Distancer(small)
+            distancer.getMazeDistances()
+            self.assertIsNone(distancer.getStats())
+        finally:
+            distanceCalculator.getRegistry().clear()
+
+    def test_multiple_targets(self):
+        layout = getLayout('mediumClassic')
+        openCells = layout.walls.asList(False)
+        source = openCells[17]
+        targets = openCells[::9]
+
+        expected = [_bfs(source, layout.walls)[target] for target in targets]
+        best = min(expected)
+        nearest = (best, targets[expected.index(best)])
+
+        try:
+            for mode in [distanceCalculator.MODE_FULL, distanceCalculator.MODE_LAZY]:
+                distancer = Distancer(layout, mode = mode)
+
+                # Without a table, a BFS is used.
+                self.assertEqual(expected, distancer.getDistances(source, targets))
+                self.assertEqual(nearest, distancer.nearest(source, targets))
+
+                distancer.getMazeDistances()
+                self.assertEqual(expected, distancer.getDistances(source, targets))
+                self.assertEqual(nearest, distancer.nearest(source, targets))
+
+                self.assertEqual([], distancer.getDistances(source, []))
+                self.assertIsNone(distancer.nearest(source, []))
+                self.assertEqual((0, source), distancer.nearest(source, targets + [source]))
+
+                # Off grid positions fall back to single lookups.
+                offGrid = (1, 1.5)
+                self.assertEqual([distancer.getDistance(offGrid, target) for target in targets],
+                        distancer.getDistances(offGrid, targets))
+        finally:
+            distanceCalculator.getRegistry().clear()
+
+    def test_maze_oracle(self):
+        layout = getLayout('mediumMaze')
+        state = PacmanGameState(layout)
+        openCells = layout.walls.asList(False)
+
+        source = openCells[0]
+        expected = _bfs(source, layout.walls)
+        for target in openCells[::13]:
+            self.assertEqual(expected[target], maze(source, target, state))
+
+        # Equal walls share an oracle.
+        oracle = distanceCalculator.getMazeOracle(layout.walls)
+        self.assertIs(oracle, distanceCalculator.getMazeOracle(getLayout('mediumMaze').walls))
+        self.assertEqual(1, oracle.getStats()['misses'])
+
+        self.assertRaises(ValueError, maze, source, (0, 0), state)
+
+    def test_incremental(self):
+        layout = getLayout('mediumClassic')
+        expected = computeDistances(layout)
+        openCells = layout.walls.asList(False)
+        registry = distanceCalculator.getRegistry()
+
+        try:
+            registry.clear()
+
+            distancer = Distancer(layout, mode = distanceCalculator.MODE_INCREMENTAL)
+            distancer.getMazeDistances()
+            self.assertFalse(distancer.isReadyForMazeDistance())
+
+            # One row at a time.
+            self.assertFalse(distancer.continueComputing(0))
+            table = distancer._distances
+            self.assertEqual(1 / len(openCells), table.getProgress())
+
+            # Known rows are exact, the rest are manhattan.
+            first, last = openCells[0], openCells[-1]
+            self.assertEqual(expected.getDistance(first, last), distancer.getDistance(last, first))
+            self.assertEqual(distanceCalculator.manhattan(openCells[1], last),
+                    distancer.getDistance(openCells[1], last))
+
+            # Another incremental distancer on the same walls shares the work.
+            other = Distancer(getLayout('mediumClassic'),
+                    mode = distanceCalculator.MODE_INCREMENTAL)
+            other.getMazeDistances()
+            self.assertIs(table, other._distances)
+
+            while (not distancer.continueComputing(0.01)):
+                pass
+
+            self.assertTrue(distancer.isReadyForMazeDistance())
+            self.assertNotIsInstance(distancer._distances,
+                    distanceCalculator.IncrementalDistanceTable)
+
+            for source in openCells[::7]:
+                for target in openCells:
+                    self.assertEqual(expected.getDistance(source, target),
+                            distancer.getDistance(source, target))
+
+            # Once finished, the full table is used by everyone.
+            self.assertTrue(other.continueComputing(0))
+            self.assertIs(distancer._distances, other._distances)
+            self.assertIs(distancer._distances,
+                    registry.getTable(layout, distanceCalculator.MODE_INCREMENTAL))
+            self.assertEqual(1, len(registry))
+        finally:
+            registry.clear()
+
+    def test_capture_agent_without_distancer(self):
+        state = CaptureGameState(getLayout('defaultCapture'), 100)
+
+        agent = _NoDistancerAgent(0)
+        agent.registerInitialState(state)
+        self.assertIsNone(agent.distancer)
+
+        self.assertEqual(state.getLegalActions(0)[0], agent.getAction(state))
+        self.assertEqual([state], agent.observationHistory)
+
+class _NoDistancerAgent(CaptureAgent):
+    """
+    A capture agent that sets itself up without a distancer.
+    """
+
+    def registerInitialState(self, gameState):
+        self.red = gameState.isOnRedTeam(self.index)
+
+    def chooseAction(self, gameState):
+        return gameState.getLegalActions(self.index)[0]
+
+def _bfs(source, walls):
+    distances = {source: 0}
+    frontier = [source]
+
+    while (len(frontier) > 0):
+        nextFrontier = []
+        for position in frontier:
+            for neighbor in Actions.getLegalNeighbors(position, walls):
+                if (neighbor not in distances):
+                    distances[neighbor] = distances[position] + 1
+                    nextFrontier.append(neighbor)
+
+        frontier = nextFrontier
+
+    return distances
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,329 @@
+import random
+import unittest
+
+from pacai.bin.capture import CaptureGameState
+from pacai.bin.pacman import PacmanGameState
+from pacai.core.directions import Directions
+from pacai.core.layout import Layout
+from pacai.core.layout import getLayout
+from pacai.student.multiagents import ExpectimaxAgent
+from pacai.student.multiagents import MinimaxAgent
+
+"""
+Test the bookkeeping that game states do as they are modified.
+"""
+class GameStateTest(unittest.TestCase):
+    def test_food_counts(self):
+        state = PacmanGameState(getLayout('mediumClassic'))
+        initialFood = state.getFood().count()
+        self.assertEqual(initialFood, state.getNumFood())
+
+        x, y = state.getFood().asList()[0]
+        successor = state._initSuccessor()
+        self.assertTrue(successor.eatFood(x, y))
+        self.assertFalse(successor.eatFood(x, y))
+
+        self.assertEqual(initialFood - 1, successor.getNumFood())
+        self.assertEqual(successor.getFood().count(), successor.getNumFood())
+        self.assertEqual(initialFood, state.getNumFood())
+
+    def test_food_view(self):
+        state = PacmanGameState(getLayout('mediumClassic'))
+        food = state.getFood()
+        x, y = food.asList()[0]
+
+        def setCell():
+            food[x][y] = False
+
+        self.assertRaises(TypeError, setCell)
+
+        foodCopy = state.getFoodCopy()
+        foodCopy[x][y] = False
+        self.assertTrue(state.hasFood(x, y))
+
+        successor = state._initSuccessor()
+        successor.eatFood(x, y)
+        self.assertTrue(food[x][y])
+        self.assertFalse(successor.getFood()[x][y])
+
+    def test_capture_food_counts(self):
+        state = CaptureGameState(getLayout('defaultCapture'), 100)
+        self.assertEqual(state.getRedFood().count(), state.getNumRedFood())
+        self.assertEqual(state.getBlueFood().count(), state.getNumBlueFood())
+
+        initialRed = state.getNumRedFood()
+        initialBlue = state.getNumBlueFood()
+
+        x, y = state.getRedFood().asList()[0]
+        successor = state._initSuccessor()
+        self.assertTrue(successor.eatFood(x, y))
+        self.assertFalse(successor.eatFood(x, y))
+
+        self.assertEqual(initialRed - 1, successor.getNumRedFood())
+        self.assertEqual(initialBlue, successor.getNumBlueFood())
+        self.assertEqual(initialRed + initialBlue - 1, successor.getNumFood())
+        self.assertEqual(initialRed, state.getNumRedFood())
+
+    def test_food_positions(self):
+        state = CaptureGameState(getLayout('defaultCapture'), 100)
+        self.assertEqual(tuple(state.getFood().asList()), state.getFoodPositions())
+        self.assertEqual(tuple(state.getRedFood().asList()), state.getRedFoodPositions())
+        self.assertEqual(tuple(state.getBlueFood().asList()), state.getBlueFoodPositions())
+
+        position = state.getBlueFoodPositions()[3]
+        successor = state._initSuccessor()
+        successor.eatFood(*position)
+
+        self.assertNotIn(position, successor.getFoodPositions())
+        self.assertNotIn(position, successor.getBlueFoodPositions())
+        self.assertEqual(tuple(successor.getFood().asList()), successor.getFoodPositions())
+        self.assertEqual(tuple(successor.getBlueFood().asList()),
+                successor.getBlueFoodPositions())
+        self.assertIn(position, state.getFoodPositions())
+
+    def test_shared_agent_states(self):
+        state = PacmanGameState(getLayout('mediumClassic'))
+        pacmanState = state.getAgentState(0)
+        pacmanPosition = pacmanState.getPosition()
+
+        successor = state.generateSuccessor(0, state.getLegalActions(0)[0])
+
+        # Only the agent that moved gets a new agent state.
+        self.assertIsNot(pacmanState, successor.getAgentState(0))
+        for index in range(1, state.getNumAgents()):
+            self.assertIs(state.getAgentState(index), successor.getAgentState(index))
+
+        self.assertEqual(pacmanPosition, state.getAgentState(0).getPosition())
+        self.assertNotEqual(pacmanPosition, successor.getAgentState(0).getPosition())
+
+        # Scaring the ghosts copies them.
+        ghostState = successor.getAgentState(1)
+        scaredState = successor._initSuccessor()
+        scaredState.getMutableAgentState(1).setScaredTimer(10)
+        self.assertFalse(ghostState.isScared())
+        self.assertTrue(scaredState.getAgentState(1).isScared())
+
+    def test_apply_undo_pacman(self):
+        self._checkApplyUndo(PacmanGameState(getLayout('smallClassic')))
+
+    def test_apply_undo_capture(self):
+        self._checkApplyUndo(CaptureGameState(getLayout('fastCapture'), 300))
+
+    def test_apply_undo_capsule(self):
+        state = PacmanGameState(Layout([
+            '%%%%%%%%',
+            '%Po.. G%',
+            '%%%%%%%%',
+        ]))
+        original = state._initSuccessor()
+
+        records = [state.applyMove(0, Directions.EAST)]
+        self.assertEqual(0, state.getNumCapsules())
+        self.assertTrue(state.getAgentState(1).isScared())
+
+        records.append(state.applyMove(1, Directions.WEST))
+        records.append(state.applyMove(0, Directions.EAST))
+        self.assertEqual(1, state.getNumFood())
+
+        while (len(records) > 0):
+            state.undoMove(records.pop())
+
+        self.assertEqual(original, state)
+        self.assertEqual(1, state.getNumCapsules())
+        self.assertEqual(2, state.getNumFood())
+        self.assertFalse(state.getAgentState(1).isScared())
+        self.assertEqual(original.getAgentState(1).getPosition(),
+                state.getAgentState(1).getPosition())
+
+    def test_apply_undo_record(self):
+        state = PacmanGameState(Layout([
+            '%%%%%%%%',
+            '%P .o G%',
+            '%%%%%%%%',
+        ]))
+        original = state._initSuccessor()
+
+        # A plain move only saves the small fields and the mover's agent state.
+        record = state.applyMove(0, Directions.EAST)
+        self.assertIsNone(record[1])
+        self.assertEqual([0, original.getAgentState(0)], record[2:])
+
+        # Eating also saves the board.
+        record = state.applyMove(0, Directions.EAST)
+        self.assertIsNotNone(record[1])
+        self.assertEqual(0, state.getNumFood())
+
+        state.undoMove(record)
+        self.assertEqual(1, state.getNumFood())
+
+        # A move that fails is undone right away.
+        self.assertRaises(ValueError, state.applyMove, 0, Directions.NORTH)
+        self.assertIsNone(state._moveRecord)
+        self.assertEqual(original.generateSuccessor(0, Directions.EAST), state)
+
+    def test_multiagent_apply_undo(self):
+        state = _CountingGameState(getLayout('minimaxClassic'))
+        original = state._initSuccessor()
+
+        agents = [
+            (MinimaxAgent(0, depth = 3), False),
+            (ExpectimaxAgent(0, depth = 3), True),
+        ]
+
+        for (agent, expect) in agents:
+            _CountingGameState.numSuccessors = 0
+            expected = _treeValue(state, 0, 0, agent, expect)
+            numSuccessors = _CountingGameState.numSuccessors
+
+            # Searching in place gives the same result as searching over successors,
+            # without creating any game states.
+            _CountingGameState.numSuccessors = 0
+            self.assertAlmostEqual(expected[0], agent.getValue(state, 0, 0)[0])
+            self.assertEqual(expected[1], agent.getAction(state))
+
+            self.assertGreater(numSuccessors, 100)
+            self.assertEqual(0, _CountingGameState.numSuccessors)
+
+            self.assertEqual(original, state)
+            self.assertEqual(hash(original), hash(state))
+
+    def _checkApplyUndo(self, initialState):
+        rng = random.Random(4)
+
+        for trial in range(10):
+            state = initialState._initSuccessor()
+            original = initialState._initSuccessor()
+
+            records = []
+            snapshots = [original]
+            agentIndex = 0
+
+            while (not state.isOver() and len(records) < 300):
+                action = rng.choice(state.getLegalActions(agentIndex))
+                successor = state.generateSuccessor(agentIndex, action)
+
+                records.append(state.applyMove(agentIndex, action))
+                self.assertEqual(successor, state)
+                self.assertEqual(hash(successor), hash(state))
+                self.assertEqual(successor.getNumFood(), state.getNumFood())
+                self.assertEqual(successor.getFoodPositions(), state.getFoodPositions())
+
+                snapshots.append(successor)
+                agentIndex = (agentIndex + 1) % state.getNumAgents()
+
+            while (len(records) > 0):
+                state.undoMove(records.pop())
+                snapshots.pop()
+                self.assertEqual(snapshots[-1], state)
+                self.assertEqual(hash(snapshots[-1]), hash(state))
+
+            self.assertEqual(original, state)
+            self.assertEqual(initialState.getNumFood(), state.getNumFood())
+
+    def test_incremental_hash(self):
+        state = PacmanGameState(getLayout('mediumClassic'))
+        first, second = state.getFood().asList()[0:2]
+        capsule = state.getCapsules()[0]
+
+        successor1 = state._initSuccessor()
+        successor1.eatFood(*first)
+        successor1.eatFood(*second)
+        successor1.eatCapsule(*capsule)
+
+        successor2 = state._initSuccessor()
+        successor2.eatCapsule(*capsule)
+        successor2.eatFood(*second)
+        successor2.eatFood(*first)
+
+        self.assertEqual(successor1, successor2)
+        self.assertEqual(hash(successor1), hash(successor2))
+        self.assertNotEqual(hash(state), hash(successor1))
+
+        table = state.getInitialLayout().getZobristTable()
+        self.assertEqual(table.hashBoard(successor1.getFood(), successor1.getCapsules()),
+                successor1._boardHash)
+
+    def test_agent_hash(self):
+        state = PacmanGameState(getLayout('mediumClassic'))
+        initialHash = hash(state)
+
+        successor = state.generateSuccessor(0, state.getLegalActions(0)[0])
+        self.assertNotEqual(initialHash, hash(successor))
+        self.assertEqual(initialHash, hash(state))
+
+        # The ghost's state is shared with the parent until the successor takes its own copy.
+        successorHash = hash(successor)
+        parentGhostHash = hash(state.getAgentState(1))
+
+        ghostState = successor.getMutableAgentState(1)
+        self.assertIsNot(state.getAgentState(1), ghostState)
+
+        ghostState.setScaredTimer(10)
+        self.assertNotEqual(parentGhostHash, hash(ghostState))
+        self.assertNotEqual(successorHash, hash(successor))
+
+        self.assertEqual(parentGhostHash, hash(state.getAgentState(1)))
+        self.assertEqual(0, state.getAgentState(1).getScaredTimer())
+        self.assertEqual(initialHash, hash(state))
+
+    def test_skip_validation(self):
+        state = PacmanGameState(getLayout('mediumClassic'))
+        legal = state.getLegalActions(0)
+        illegal = [action for action in Directions.CARDINAL if action not in legal][0]
+
+        self.assertRaises(ValueError, state.generateSuccessor, 0, illegal)
+        self.assertEqual(state.generateSuccessor(0, legal[0]),
+                state.generateSuccessor(0, legal[0], validate = False))
+
+        # Trusted callers skip the check, unless validation is forced.
+        state.generateSuccessor(0, illegal, validate = False)
+
+        try:
+            PacmanGameState.setForceValidation(True)
+            self.assertRaises(ValueError, state.generateSuccessor, 0, illegal, validate = False)
+            self.assertRaises(ValueError, state.applyMove, 0, illegal, validate = False)
+        finally:
+            PacmanGameState.setForceValidation(False)
+
+class _CountingGameState(PacmanGameState):
+    """
+    A pacman game state that counts how many successors are made.
+    """
+
+    numSuccessors = 0
+
+    def _initSuccessor(self):
+        _CountingGameState.numSuccessors += 1
+        return super()._initSuccessor()
+
+def _treeValue(state, agentIndex, depth, agent, expect):
+    """
+    Minimax (or expectimax) over successors, the same way the student agents search.
+    """
+
+    legalActions = state.getLegalActions(agentIndex)
+    if (len(legalActions) == 0 or depth == agent.getTreeDepth()
+            or state.isWin() or state.isLose()):
+        return (agent.getEvaluationFunction()(state), '')
+
+    nextIndex = (agentIndex + 1) % state.getNumAgents()
+    nextDepth = depth
+    if (nextIndex == 0):
+        nextDepth += 1
+
+    values = []
+    for action in legalActions:
+        successor = state.generateSuccessor(agentIndex, action)
+        values.append((_treeValue(successor, nextIndex, nextDepth, agent, expect)[0], action))
+
+    if (agentIndex == 0):
+        # Ties go to the last action.
+        return max(reversed(values), key = lambda value: value[0])
+
+    if (expect):
+        return (sum(value for (value, action) in values) / len(values), values[-1][1])
+
+    return min(reversed(values), key = lambda value: value[0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+
+from pacai.core.grid import Grid
+
+"""
+Test the bit-packed boolean grid.
+"""
+class GridTest(unittest.TestCase):
+    def test_get_set(self):
+        grid = Grid(4, 3)
+        self.assertFalse(grid[2][1])
+
+        grid[2][1] = True
+        self.assertTrue(grid[2][1])
+        self.assertTrue(grid[-2][-2])
+        self.assertEqual([False, True, False], list(grid[2]))
+
+        grid[2][1] = False
+        self.assertFalse(grid[2][1])
+
+        self.assertRaises(IndexError, lambda: grid[4][0])
+        self.assertRaises(IndexError, lambda: grid[0][3])
+
+    def test_count_and_list(self):
+        grid = Grid(4, 3, initialValue = True)
+        self.assertEqual(12, grid.count())
+        self.assertEqual(0, grid.count(False))
+
+        grid[0][0] = False
+        grid[3][2] = False
+        self.assertEqual(10, grid.count())
+        self.assertEqual(2, grid.count(False))
+        self.assertEqual([(0, 0), (3, 2)], grid.asList(False))
+
+        expected = [(x, y) for x in range(4) for y in range(3) if (x, y) not in [(0, 0), (3, 2)]]
+        self.assertEqual(expected, grid.asList())
+
+    def test_copy(self):
+        grid = Grid(5, 5)
+        grid[1][1] = True
+
+        other = grid.copy()
+        self.assertEqual(grid, other)
+        self.assertEqual(hash(grid), hash(other))
+
+        other[1][1] = False
+        self.assertTrue(grid[1][1])
+        self.assertFalse(other[1][1])
+        self.assertNotEqual(grid, other)
+
+    def test_equality_dimensions(self):
+        self.assertNotEqual(Grid(2, 3), Grid(3, 2))
+        self.assertEqual(Grid(2, 3), Grid(2, 3))
+
+    def test_set_column(self):
+        grid = Grid(2, 3)
+        grid[1] = [True, False, True]
+        self.assertEqual([(1, 0), (1, 2)], grid.asList())
+
+        self.assertRaises(ValueError, grid.__setitem__, 0, [True])
+
+    def test_frozen(self):
+        grid = Grid(3, 3)
+        grid[1][2] = True
+
+        frozen = grid.freeze()
+        self.assertEqual(grid, frozen)
+        self.assertEqual(hash(grid), hash(frozen))
+        self.assertIs(frozen, frozen.freeze())
+
+        def setCell():
+            frozen[0][0] = True
+
+        self.assertRaises(TypeError, setCell)
+        self.assertRaises(TypeError, frozen.__setitem__, 0, [True, True, True])
+
+        # A snapshot does not see later changes to the original.
+        grid[0][0] = True
+        self.assertFalse(frozen[0][0])
+
+        # Copies are modifiable.
+        modifiable = frozen.copy()
+        modifiable[2][2] = True
+        self.assertTrue(modifiable[2][2])
+
+    def test_updated(self):
+        frozen = Grid(3, 3, initialValue = True).freeze()
+        updated = frozen.updated(1, 1, False)
+
+        self.assertTrue(frozen[1][1])
+        self.assertFalse(updated[1][1])
+        self.assertEqual(8, updated.count())
+        self.assertIsInstance(updated, type(frozen))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+import unittest
+
+from pacai.core.actions import Actions
+from pacai.core.directions import Directions
+from pacai.core.layout import Layout
+from pacai.core.layout import getLayout
+
+"""
+Test the tables that layouts precompute.
+"""
+class LayoutTest(unittest.TestCase):
+    def test_action_tables(self):
+        for name in ['mediumClassic', 'defaultCapture', 'tinyMaze', 'openSearch']:
+            layout = getLayout(name)
+            walls = layout.walls
+
+            for (x, y) in walls.asList(False):
+                if (x in (0, layout.width - 1) or y in (0, layout.height - 1)):
+                    continue
+
+                expected = Actions.getPossibleActions((x, y), Directions.STOP, walls)
+                self.assertEqual(tuple(expected), layout.getPossibleActions((x, y)))
+
+                for direction in Directions.CARDINAL + [Directions.STOP]:
+                    expected = Actions.getPossibleGhostActions((x, y), direction, walls)
+                    self.assertEqual(tuple(expected),
+                            layout.getPossibleGhostActions((x, y), direction))
+
+    def test_action_tables_off_grid(self):
+        layout = getLayout('mediumClassic')
+        self.assertIsNone(layout.getPossibleActions((0, 0)))
+        self.assertIsNone(layout.getPossibleActions((1.5, 1)))
+        self.assertIsNone(layout.getPossibleGhostActions((1.5, 1), Directions.EAST))
+        self.assertIsNotNone(layout.getPossibleActions((1.0, 1.0)))
+
+    def test_graph(self):
+        for name in ['mediumClassic', 'defaultCapture', 'tinyMaze']:
+            layout = getLayout(name)
+            graph = layout.getGraph()
+            openCells = layout.walls.asList(False)
+
+            self.assertEqual(len(openCells), graph.getNumCells())
+            self.assertEqual(len(graph.offsets), graph.getNumCells() + 1)
+            self.assertEqual(len(graph.neighbors), len(graph.actions))
+
+            for cellId, position in enumerate(openCells):
+                self.assertEqual(cellId, graph.getCellId(position))
+                self.assertEqual(position, graph.getPosition(cellId))
+
+                neighbors = [graph.getPosition(other) for other in graph.getNeighbors(cellId)]
+                self.assertEqual(len(neighbors), graph.getDegree(cellId))
+                self.assertEqual(sorted(neighbors),
+                        sorted(set(Actions.getLegalNeighbors(position, layout.walls)) - {position}))
+
+                for neighbor, action in graph.getSuccessors(position):
+                    self.assertEqual(neighbor, Actions.getSuccessor(position, action))
+
+                self.assertEqual(graph.getSuccessors(position),
+                        tuple((graph.getPosition(other), action)
+                            for other, action in graph.getSuccessorIds(cellId)))
+
+    def test_graph_off_grid(self):
+        # Open cells on the edge of the board have no neighbors off the board.
+        layout = Layout([
+            '. .',
+            '%P%',
+        ])
+        graph = layout.getGraph()
+
+        self.assertEqual(4, graph.getNumCells())
+        self.assertEqual((
+            ((1, 0), Directions.SOUTH),
+            ((2, 1), Directions.EAST),
+            ((0, 1), Directions.WEST),
+        ), graph.getSuccessors((1, 1)))
+        self.assertEqual((((1, 1), Directions.EAST),), graph.getSuccessors((0, 1)))
+        self.assertIsNone(graph.getCellId((0, 0)))
+        self.assertIsNone(graph.getCellId((1.5, 1)))
+        self.assertIsNone(graph.getSuccessors((-1, 1)))
+
+    def test_junction_graph(self):
+        for name in ['bigMaze', 'mediumClassic', 'openMaze']:
+            layout = getLayout(name)
+            graph = layout.getGraph()
+            junctionGraph = layout.getJunctionGraph()
+
+            covered = set()
+
+            for junction in junctionGraph.getJunctions():
+                self.assertTrue(junctionGraph.isJunction(junction))
+                self.assertEqual(graph.getDegree(junction), len(junctionGraph.getEdges(junction)))
+                covered.add(junction)
+
+                for edge in junctionGraph.getEdges(junction):
+                    target, cells, actions = edge
+                    self.assertTrue(junctionGraph.isJunction(target))
+                    self.assertEqual(target, cells[-1])
+                    self.assertEqual(len(cells), len(actions))
+
+                    # Interior cells are all corridor.
+                    for cellId in cells[:-1]:
+                        self.assertFalse(junctionGraph.isJunction(cellId))
+                        self.assertEqual(2, graph.getDegree(cellId))
+
+                    self._checkWalk(graph, cells, actions, start = junction)
+                    self._checkWalk(graph, *junctionGraph.reverseEdge(junction, edge)[1:],
+                            start = target)
+
+                    covered.update(cells)
+
+            self.assertEqual(set(range(graph.getNumCells())), covered)
+
+        # bigMaze is mostly corridors.
+        junctionGraph = getLayout('bigMaze').getJunctionGraph()
+        self.assertLess(3 * junctionGraph.getNumJunctions(),
+                junctionGraph.getGraph().getNumCells())
+
+    def test_junction_graph_loop(self):
+        # A loop of corridor has no natural junction, so one of its cells is used.
+        layout = Layout([
+            '%%%%%',
+            '%P..%',
+            '%.%.%',
+            '%...%',
+            '%%%%%',
+        ])
+        graph = layout.getGraph()
+        junctionGraph = layout.getJunctionGraph()
+
+        self.assertEqual(1, junctionGraph.getNumJunctions())
+
+        junction = junctionGraph.getJunctions()[0]
+        for (target, cells, actions) in junctionGraph.getEdges(junction):
+            self.assertEqual(junction, target)
+            self.assertEqual(8, len(cells))
+            self._checkWalk(graph, cells, actions, start = junction)
+
+        # Corridor cells walk both ways to the junction.
+        corridor = graph.getCellId((2, 1))
+        edges = junctionGraph.getEdges(corridor)
+        self.assertEqual(2, len(edges))
+        self.assertEqual(8, sum(len(cells) for (target, cells, actions) in edges))
+
+    def _checkWalk(self, graph, cells, actions, start = None):
+        position = graph.getPosition(start)
+        for cellId, action in zip(cells, actions):
+            position = Actions.getSuccessor(position, action)
+            self.assertEqual(graph.getPosition(cellId), position)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+
+from pacai.bin.pacman import PacmanGameState
+from pacai.core.layout import getLayout
+from pacai.core.search import engine
+from pacai.core.search.bitmask import BitmaskIndex
+from pacai.core.search.bitmask import BitmaskState
+from pacai.core.search.food import FoodSearchProblem
+from pacai.student.searchAgents import CornersProblem
+
+"""
+Test the bitmask encoded search states.
+"""
+class BitmaskTest(unittest.TestCase):
+    def test_state(self):
+        graph = getLayout('tinySearch').getGraph()
+        positions = [(1, 1), (3, 5), (7, 5)]
+        index = BitmaskIndex(graph, positions)
+
+        self.assertEqual(0b111, index.getFullMask())
+        self.assertEqual(0b101, index.toMask([(1, 1), (7, 5)]))
+        self.assertEqual([(1, 1), (7, 5)], index.toList(0b101))
+        self.assertEqual([graph.getCellId((1, 1)), graph.getCellId((7, 5))], index.toCellIds(0b101))
+        self.assertEqual(0b010, index.getCellBit(graph.getCellId((3, 5))))
+        self.assertEqual(0, index.getCellBit(graph.getCellId((4, 5))))
+
+        cellId = graph.getCellId((3, 5))
+        state = BitmaskState(cellId, 0b101, index)
+
+        self.assertEqual(state, BitmaskState(cellId, 0b101, index))
+        self.assertEqual(hash(state), hash(BitmaskState(cellId, 0b101, index)))
+        self.assertNotEqual(state, BitmaskState(cellId, 0b100, index))
+        self.assertLess(BitmaskState(cellId, 0b100, index), state)
+
+        # States still work like (position, grid) tuples.
+        position, items = state
+        self.assertEqual((3, 5), position)
+        self.assertEqual((3, 5), state[0])
+        self.assertEqual([(1, 1), (7, 5)], items.asList())
+        self.assertEqual(2, state[1].count())
+        self.assertEqual(1, state[1].count(False))
+        self.assertIn((7, 5), items)
+        self.assertNotIn((3, 5), items)
+        self.assertNotIn((4, 5), items)
+
+    def test_food_problem(self):
+        state = PacmanGameState(getLayout('tinySearch'))
+        problem = FoodSearchProblem(state)
+
+        start = problem.startingState()
+        self.assertEqual(state.getPacmanPosition(), start[0])
+        self.assertEqual(state.getFood().asList(), start[1].asList())
+        self.assertEqual(state.getNumFood(), start[1].count())
+
+        # Moving onto food eats it.
+        for (successor, action, cost) in problem.successorStates(start):
+            expected = [food for food in start[1].asList() if food != successor[0]]
+
+            self.assertEqual(1, cost)
+            self.assertEqual(expected, successor[1].asList())
+
+        path = engine.ucs(problem)
+        self.assertEqual(27, problem.actionsCost(path))
+
+    def test_corners_problem(self):
+        state = PacmanGameState(getLayout('tinyCorners'))
+        problem = CornersProblem(state)
+
+        start = problem.startingState()
+        self.assertEqual(state.getPacmanPosition(), start[0])
+        self.assertEqual([], start[1].asList())
+
+        path = engine.bfs(problem)
+        self.assertEqual(28, problem.actionsCost(path))
+
+if __name__ == '__main__':
+    unittest.main()
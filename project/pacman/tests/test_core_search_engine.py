@@ -0,0 +1,270 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+
+from pacai.agents.search.base import SearchAgent
+from pacai.agents.search.foodsearch import AStarFoodSearchAgent
+from pacai.bin.pacman import PacmanGameState
+from pacai.core.actions import Actions
+from pacai.core.layout import getLayout
+from pacai.core.search import engine
+from pacai.core.search.heuristic import manhattan
+from pacai.core.search.junction import JunctionSearchProblem
+from pacai.core.search.position import PositionSearchProblem
+from pacai.core.search.problem import SearchProblem
+from pacai.student import search
+
+"""
+Test the library search engine.
+"""
+class SearchEngineTest(unittest.TestCase):
+    def test_weighted_graph(self):
+        problem = GraphProblem()
+
+        self.assertEqual(['A->C', 'C->G'], engine.bfs(problem))
+        self.assertEqual(['A->B', 'B->C', 'C->D', 'D->G'], engine.ucs(problem))
+        self.assertEqual(['A->B', 'B->C', 'C->D', 'D->G'], engine.astar(problem, graphHeuristic))
+        self.assertEqual(['A->C', 'C->G'], engine.greedy(problem, graphHeuristic))
+
+        self.assertEqual(['A->B', 'B->C', 'C->D', 'D->G'], engine.bidirectional(problem))
+        self.assertEqual(['A->B', 'B->C', 'C->D', 'D->G'], engine.idastar(problem, graphHeuristic))
+        self.assertEqual(['A->B', 'B->C', 'C->D', 'D->G'], engine.smastar(problem, graphHeuristic))
+
+        path = engine.dfs(problem)
+        self.assertEqual('A', path[0][0])
+        self.assertEqual('G', path[-1][-1])
+
+    def test_no_path(self):
+        problem = GraphProblem(goal = 'Z')
+
+        for searchFunction in engine.SEARCH_FUNCTIONS.values():
+            self.assertIsNone(searchFunction(problem))
+
+    def test_heuristic_cache(self):
+        calls = []
+
+        def countingHeuristic(state, problem):
+            calls.append(state)
+            return graphHeuristic(state, problem)
+
+        path = engine.astar(GraphProblem(), countingHeuristic, cacheHeuristic = True)
+        self.assertEqual(['A->B', 'B->C', 'C->D', 'D->G'], path)
+        self.assertEqual(len(set(calls)), len(calls))
+
+    def test_maze(self):
+        state = PacmanGameState(getLayout('bigMaze'))
+
+        for name in ['bfs', 'ucs', 'astar']:
+            problem = PositionSearchProblem(state)
+            path = engine.SEARCH_FUNCTIONS[name](problem)
+            self.assertEqual(210, problem.actionsCost(path))
+
+        problem = PositionSearchProblem(state)
+        path = engine.astar(problem, manhattan)
+        self.assertEqual(210, problem.actionsCost(path))
+
+    def test_bidirectional_maze(self):
+        state = PacmanGameState(getLayout('mediumMaze'))
+
+        # Costs that depend on the position, so the backward costs must be charged correctly.
+        costFn = lambda position: 2 ** position[0]
+
+        expected = PositionSearchProblem(state, costFn = costFn)
+        expectedPath = engine.ucs(expected)
+
+        problem = PositionSearchProblem(state, costFn = costFn)
+        path = engine.bidirectional(problem)
+
+        self.assertEqual(expected.actionsCost(expectedPath), problem.actionsCost(path))
+        self.assertLess(problem.getExpandedCount(), expected.getExpandedCount())
+
+        # The cells from both ends are highlighted, and reaching the goal is recorded last.
+        visitHistory = problem.getVisitHistory()
+        self.assertEqual(len(visitHistory) - 1, len(set(visitHistory[:-1])))
+        self.assertIn(problem.startingState(), visitHistory)
+        self.assertEqual(problem.goal, visitHistory[-1])
+
+        # Stats are kept the same way as the other searches.
+        stats = problem.getStats()
+        self.assertGreater(stats.closedSize, 0)
+        self.assertLessEqual(problem.getExpandedCount(), stats.closedSize)
+
+        problem = PositionSearchProblem(state, goal = state.getPacmanPosition())
+        self.assertEqual([], engine.bidirectional(problem))
+
+    def test_junction_problem(self):
+        state = PacmanGameState(getLayout('bigMaze'))
+
+        costFns = [
+            lambda position: 1,
+            lambda position: 2 ** (position[0] % 4),
+        ]
+
+        for costFn in costFns:
+            for name in ['ucs', 'astar', 'bidirectional']:
+                expected = PositionSearchProblem(state, costFn = costFn)
+                expectedCost = expected.actionsCost(engine.SEARCH_FUNCTIONS[name](expected))
+
+                problem = JunctionSearchProblem(state, costFn = costFn)
+                path = problem.expandActions(engine.SEARCH_FUNCTIONS[name](problem))
+
+                self.assertEqual(expectedCost, sum(costFn(position)
+                        for position in self._walk(problem.startingState(), path)[1:]))
+                self.assertLess(problem.getExpandedCount(), expected.getExpandedCount() / 2)
+
+        # The start and the goal are in the middle of the same corridor.
+        start = (8, 1)
+        for goal in [(10, 1), (7, 1), start]:
+            problem = JunctionSearchProblem(state, start = start, goal = goal)
+            path = problem.expandActions(engine.ucs(problem))
+
+            self.assertEqual(abs(goal[0] - start[0]), len(path))
+            self.assertEqual(goal, self._walk(start, path)[-1])
+
+        self.assertIsNone(problem.expandActions(None))
+
+        # Searches that price partial paths with actionsCost() get corridor actions.
+        studentSearches = [
+            search.uniformCostSearch,
+            lambda problem: search.aStarSearch(problem, manhattan),
+        ]
+
+        for studentSearch in studentSearches:
+            problem = JunctionSearchProblem(state)
+            path = studentSearch(problem)
+
+            self.assertEqual(210, problem.actionsCost(path))
+            self.assertEqual(210, problem.actionsCost(problem.expandActions(path)))
+
+        agent = SearchAgent(0, fn = 'ucs', prob = JunctionSearchProblem)
+        agent.registerInitialState(state)
+        self.assertEqual(210, len(agent._actions))
+
+    def test_memory_bounded(self):
+        # Too little memory for the whole path.
+        problem = GraphProblem()
+        self.assertEqual(['A->B', 'B->C', 'C->D', 'D->G'],
+                engine.smastar(problem, graphHeuristic, maxNodes = 2))
+        self.assertEqual(['A->B', 'B->C', 'C->D', 'D->G'],
+                engine.idastar(problem, graphHeuristic, maxNodes = 1))
+
+        state = PacmanGameState(getLayout('mediumMaze'))
+
+        for searchFunction in [engine.idastar, engine.smastar]:
+            problem = PositionSearchProblem(state)
+            path = searchFunction(problem, manhattan, maxNodes = 150)
+
+            self.assertEqual(68, problem.actionsCost(path))
+            self.assertLessEqual(problem.getStats().closedSize, 150)
+
+        state = PacmanGameState(getLayout('tinySearch'))
+
+        for algorithm in ['astar', 'idastar', 'smastar']:
+            agent = AStarFoodSearchAgent(0, algorithm = algorithm, maxNodes = '500')
+            agent.registerInitialState(state)
+            self.assertEqual(27, len(agent._actions))
+
+        self.assertRaises(ValueError, AStarFoodSearchAgent, 0, algorithm = 'bogus')
+
+    def test_stats(self):
+        problem = GraphProblem()
+        engine.astar(problem, graphHeuristic)
+
+        stats = problem.getStats()
+        self.assertEqual(6, stats.generated)
+        self.assertEqual(5, stats.closedSize)
+        self.assertEqual(3, stats.maxFrontier)
+        self.assertEqual(7, stats.heuristicCalls)
+        self.assertGreater(stats.successorTime, 0.0)
+
+    def test_agent_stats(self):
+        state = PacmanGameState(getLayout('mediumMaze'))
+
+        with tempfile.TemporaryDirectory() as tempDir:
+            csvPath = os.path.join(tempDir, 'stats.csv')
+            jsonPath = os.path.join(tempDir, 'stats.json')
+
+            for i in range(2):
+                agent = SearchAgent(0, fn = 'ucs', statsPath = csvPath)
+                agent.registerInitialState(state)
+
+            agent = SearchAgent(0, fn = 'bfs', statsPath = jsonPath, traceMemory = 'True')
+            agent.registerInitialState(state)
+
+            with open(csvPath, 'r') as file:
+                rows = list(csv.DictReader(file))
+
+            self.assertEqual(2, len(rows))
+            self.assertEqual('ucs', rows[0]['function'])
+            self.assertEqual('PositionSearchProblem', rows[0]['problem'])
+            self.assertEqual('68', rows[1]['pathCost'])
+            self.assertEqual('', rows[1]['peakMemory'])
+
+            with open(jsonPath, 'r') as file:
+                stats = json.load(file)
+
+            self.assertEqual('bfs', stats['function'])
+            self.assertEqual(68, stats['pathLength'])
+            self.assertGreater(stats['expanded'], 0)
+            self.assertGreater(stats['generated'], stats['expanded'])
+            self.assertGreater(stats['peakMemory'], 0)
+
+    def _walk(self, position, actions):
+        """
+        Get the positions entered by taking actions from position.
+        """
+
+        positions = [position]
+        for action in actions:
+            positions.append(Actions.getSuccessor(positions[-1], action))
+
+        return positions
+
+class GraphProblem(SearchProblem):
+    """
+    A small weighted graph where the cheapest path is not the shortest one.
+    """
+
+    EDGES = {
+        'A': [('B', 1), ('C', 5)],
+        'B': [('C', 1)],
+        'C': [('D', 1), ('G', 5)],
+        'D': [('G', 1)],
+        'G': [],
+    }
+
+    def __init__(self, goal = 'G'):
+        super().__init__()
+        self.goal = goal
+
+    def actionsCost(self, actions):
+        return len(actions)
+
+    def isGoal(self, state):
+        return state == self.goal
+
+    def startingState(self):
+        return 'A'
+
+    def predecessorStates(self, state):
+        self._numExpanded += 1
+
+        predecessors = []
+        for (other, edges) in self.EDGES.items():
+            for (neighbor, cost) in edges:
+                if (neighbor == state):
+                    predecessors.append((other, other + '->' + state, cost))
+
+        return predecessors
+
+    def successorStates(self, state):
+        self._numExpanded += 1
+        return [(other, state + '->' + other, cost) for (other, cost) in self.EDGES.get(state, [])]
+
+def graphHeuristic(state, problem):
+    return {'A': 3, 'B': 2, 'C': 1, 'D': 1, 'G': 0}.get(state, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+from pacai.bin.pacman import PacmanGameState
+from pacai.core.layout import getLayout
+from pacai.core.search import engine
+from pacai.core.search import heuristic
+from pacai.core.search.food import FoodSearchProblem
+
+"""
+Test the library heuristics.
+"""
+class HeuristicTest(unittest.TestCase):
+    def test_food_heuristics(self):
+        state = PacmanGameState(getLayout('trickySearch'))
+
+        for foodHeuristic in [heuristic.foodMST, heuristic.foodFarthestPair]:
+            problem = FoodSearchProblem(state)
+            path = engine.astar(problem, foodHeuristic)
+
+            self.assertEqual(60, problem.actionsCost(path))
+            self.assertLess(problem.getExpandedCount(), 500)
+
+            # Every state on an optimal path is no further from the goal than the heuristic says.
+            searchState = problem.startingState()
+            for i in range(len(path) + 1):
+                self.assertLessEqual(foodHeuristic(searchState, problem), len(path) - i)
+
+                if (i < len(path)):
+                    searchState = self._move(problem, searchState, path[i])
+
+            self.assertEqual(0, foodHeuristic(searchState, problem))
+
+    def test_food_heuristic_memo(self):
+        state = PacmanGameState(getLayout('tinySearch'))
+        problem = FoodSearchProblem(state)
+
+        oldMax = heuristic.MAX_FOOD_HEURISTIC_ENTRIES
+        heuristic.MAX_FOOD_HEURISTIC_ENTRIES = 5
+
+        try:
+            path = engine.astar(problem, heuristic.foodMST)
+        finally:
+            heuristic.MAX_FOOD_HEURISTIC_ENTRIES = oldMax
+
+        self.assertEqual(27, problem.actionsCost(path))
+        self.assertEqual(5, len(problem.heuristicInfo['foodMST']))
+
+        # The same food (anywhere) is a memo hit.
+        start = problem.startingState()
+        problem.heuristicInfo['foodMST'][start.mask] = 1000
+        self.assertGreater(heuristic.foodMST(start, problem), 1000)
+
+    def _move(self, problem, state, action):
+        for (successor, successorAction, cost) in problem.successorStates(state):
+            if (successorAction == action):
+                return successor
+
+        self.fail('Illegal action %s from %s.' % (action, state))
+
+if __name__ == '__main__':
+    unittest.main()
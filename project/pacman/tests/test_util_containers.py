@@ -1,3 +1,4 @@
+import random
 import unittest
 
 from pacai.util import priorityQueue
@@ -52,5 +53,75 @@ class UtilContainersTest(unittest.TestCase):
         for val, pri in reversed(val_list):
             self.assertEqual(val, testPriorityQueue.pop())
 
+    def test_indexed_priority_queue(self):
+        testPriorityQueue = priorityQueue.IndexedPriorityQueue()
+        self.assertTrue(testPriorityQueue.isEmpty())
+
+        for val in range(1, 10):
+            testPriorityQueue.push(val, 10 - val)
+        self.assertEqual(9, len(testPriorityQueue))
+
+        # Decrease-key without duplicates.
+        self.assertTrue(testPriorityQueue.update(1, 0))
+        self.assertFalse(testPriorityQueue.update(2, 100))
+        self.assertTrue(testPriorityQueue.update(10, 1))
+        self.assertEqual(10, len(testPriorityQueue))
+        self.assertEqual(8, testPriorityQueue.getPriority(2))
+        self.assertIn(10, testPriorityQueue)
+
+        # Push can also raise a priority.
+        testPriorityQueue.push(9, 50)
+
+        expected = [1, 10, 8, 7, 6, 5, 4, 3, 2, 9]
+        self.assertEqual(expected, [testPriorityQueue.pop() for i in range(10)])
+        self.assertTrue(testPriorityQueue.isEmpty())
+        self.assertIsNone(testPriorityQueue.getPriority(1))
+        self.assertRaises(IndexError, testPriorityQueue.pop)
+
+    def test_indexed_priority_queue_random(self):
+        random.seed(0)
+        testPriorityQueue = priorityQueue.IndexedPriorityQueue()
+        priorities = {}
+
+        for i in range(500):
+            item = random.randrange(100)
+            priority = random.randrange(50)
+            if (random.random() < 0.5):
+                testPriorityQueue.push(item, priority)
+                priorities[item] = priority
+            elif (testPriorityQueue.update(item, priority)):
+                priorities[item] = priority
+
+        popped = []
+        while (not testPriorityQueue.isEmpty()):
+            priority, item = testPriorityQueue.popWithPriority()
+            self.assertEqual(priorities.pop(item), priority)
+            popped.append(priority)
+
+        self.assertEqual(sorted(popped), popped)
+        self.assertEqual({}, priorities)
+
+    def test_bucket_queue(self):
+        testBucketQueue = priorityQueue.BucketQueue()
+        self.assertTrue(testBucketQueue.isEmpty())
+
+        for val, pri in [('a', 3), ('b', 1), ('c', 3), ('d', 0), ('e', 1)]:
+            testBucketQueue.push(val, pri)
+        self.assertEqual(5, len(testBucketQueue))
+
+        self.assertEqual('d', testBucketQueue.pop())
+        self.assertEqual('b', testBucketQueue.pop())
+
+        # Pushing below the current minimum still works.
+        testBucketQueue.push('f', 0)
+        self.assertEqual((0, 'f'), testBucketQueue.popWithPriority())
+
+        self.assertEqual(['e', 'a', 'c'], [testBucketQueue.pop() for i in range(3)])
+        self.assertTrue(testBucketQueue.isEmpty())
+
+        self.assertRaises(ValueError, testBucketQueue.push, 'g', -1)
+        self.assertRaises(ValueError, testBucketQueue.push, 'g', 1.5)
+        self.assertRaises(IndexError, testBucketQueue.pop)
+
 if __name__ == '__main__':
     unittest.main()